@@ -1,13 +1,49 @@
-from .simple import SimpleAction
+# Actions are imported on first use, so importing this package doesn't import
+# Celery, or any other action's dependencies, in processes that never use them.
+import importlib
+import importlib.util
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .asynchronous import AsyncAction
+    from .batch import BatchAction
+    from .process_pool import ProcessPoolAction
+    from .queryset import QuerySetAction
+    from .queue_celery import QueueCeleryAction  # noqa: F401
+    from .simple import SimpleAction
+    from .thread_pool import ThreadPoolAction
+
+_modules = {
+    "AsyncAction": ".asynchronous",
+    "BatchAction": ".batch",
+    "ProcessPoolAction": ".process_pool",
+    "QuerySetAction": ".queryset",
+    "QueueCeleryAction": ".queue_celery",
+    "SimpleAction": ".simple",
+    "ThreadPoolAction": ".thread_pool",
+}
 
 __all__ = [
+    "AsyncAction",
+    "BatchAction",
+    "ProcessPoolAction",
+    "QuerySetAction",
     "SimpleAction",
+    "ThreadPoolAction",
 ]
 
-# Guard import for Celery integration
-try:
-    from .queue_celery import QueueCeleryAction  # noqa: F401
-except ImportError:
-    pass
-else:
+# Guard export for Celery integration, without importing it
+if importlib.util.find_spec("celery") is not None:
     __all__.append("QueueCeleryAction")
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_modules[name], __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,129 @@
+"""Provides an admin action that awaits a coroutine function for records."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from typing import Any
+
+from asgiref.sync import async_to_sync
+from django.db.models import Model
+
+from action_hero.lib import AdminActionBaseClass, AsyncFunction, item_pk
+
+__all__ = ["AsyncAction"]
+
+
+class AsyncAction(AdminActionBaseClass):
+    """Generates an admin action awaiting a coroutine function for records.
+
+    The coroutine function is awaited with the primary key of each record. The
+    records of a batch are handled concurrently, with at most
+    ``max_concurrency`` calls in flight at once. This suits I/O-bound work
+    written with async clients like ``httpx.AsyncClient``.
+
+    Admin actions are synchronous, so each batch runs to completion in an event
+    loop managed by :external:py:func:`asgiref.sync.async_to_sync`. Records are
+    still fetched and checked against the condition synchronously, so
+    conditions may use the ORM freely.
+
+    An exception in one call doesn't stop the others. Failed records are
+    counted and reported alongside the successful ones when the action ends.
+    Pass ``on_error="raise"`` to stop the run after a batch with failures
+    instead.
+
+    Example usage::
+
+        async def notify(record_pk):
+            async with httpx.AsyncClient() as client:
+                await client.post(WEBHOOK_URL, json={"pk": record_pk})
+
+        notify_action = AsyncAction(notify, max_concurrency=20)
+
+        class MyModelAdmin(admin.ModelAdmin):
+            actions = [notify_action]
+            model = MyModel
+    """
+
+    __slots__ = ("max_concurrency",)
+
+    function: AsyncFunction
+    pk_only = True
+    default_on_error = "skip"
+
+    async def ahandle_item(self, item: Model) -> None:
+        """Awaits the function for the given item.
+
+        Args:
+            item: The model instance, or its primary key, being processed.
+        """
+        await self.function(item_pk(item))
+
+    async def ahandle_batch(self, items: list[Any]) -> list[tuple[Any, Exception]]:
+        """Awaits ``self.ahandle_item`` for every item, concurrently.
+
+        Args:
+            items: The model instances, or their primary keys, being processed.
+
+        Returns:
+            The items that raised an exception, with the exception.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        throttle = self.throttle
+
+        async def _limited(item: Any) -> None:
+            async with semaphore:
+                if throttle is None:
+                    await self.ahandle_item(item)
+                    return
+                await asyncio.to_thread(throttle.acquire)  # Keep the loop free
+                try:
+                    await self.ahandle_item(item)
+                finally:
+                    throttle.release()
+
+        outcomes = await asyncio.gather(
+            *(_limited(item) for item in items), return_exceptions=True
+        )
+        return [
+            (item, outcome)
+            for item, outcome in zip(items, outcomes, strict=True)
+            if isinstance(outcome, Exception)
+        ]
+
+    def handle_item(self, item: Model):
+        """Awaits the function for the given item in a managed event loop.
+
+        Args:
+            item: The model instance, or its primary key, being processed.
+        """
+        async_to_sync(self.ahandle_item)(item)
+
+    def handle_batch(self, items: list[Any]) -> list[tuple[Any, Exception]]:
+        """Handles the batch concurrently in a managed event loop.
+
+        Args:
+            items: The model instances, or their primary keys, being processed.
+
+        Returns:
+            The items that raised an exception, with the exception.
+        """
+        return async_to_sync(self.ahandle_batch)(items)
+
+    def __init__(
+        self, function: AsyncFunction, *, max_concurrency: int = 10, **options: Any
+    ):
+        """Initializes the action with a coroutine function.
+
+        Args:
+            function: Coroutine function that takes a model instance's primary
+                key.
+            max_concurrency: Maximum number of calls awaited at the same time.
+            options: Any other options of ``AdminActionBaseClass``.
+        """
+        if not inspect.iscoroutinefunction(function):
+            raise TypeError("The function must be a coroutine function.")
+        if max_concurrency < 1:
+            raise ValueError("The max_concurrency must be a positive integer.")
+        self.max_concurrency = max_concurrency
+        super().__init__(function, **options)
@@ -0,0 +1,57 @@
+"""Provides an admin action that calls a function once per batch of records."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.db.models import Model
+
+from action_hero.lib import AdminActionBaseClass, item_pk
+
+__all__ = ["BatchAction"]
+
+
+class BatchAction(AdminActionBaseClass):
+    """Generates an admin action calling a function with batches of records.
+
+    Instead of calling ``function`` once per record, ``BatchAction`` calls it
+    once per batch with a list of primary keys. This lets the function do its
+    work in bulk, e.g. with a single ``UPDATE`` or ``bulk_create``. The size of
+    each batch is controlled by ``chunk_size``; without one, every selected
+    record is passed in a single call.
+
+    Example usage::
+
+        def archive_records(record_pks):
+            MyModel.objects.filter(pk__in=record_pks).update(archived=True)
+
+        archive_action = BatchAction(archive_records, chunk_size=500)
+
+        class MyModelAdmin(admin.ModelAdmin):
+            actions = [archive_action]
+            model = MyModel
+    """
+
+    __slots__ = ()
+
+    pk_only = True
+
+    def handle_batch(self, items: list[Any]) -> None:
+        """Calls the function with the primary keys of a batch of items.
+
+        Each call takes a single slot of ``self.throttle``.
+
+        Args:
+            items: The model instances, or their primary keys, being processed.
+        """
+        pks = [item_pk(item) for item in items]
+        with self.throttled():
+            self.function(pks)
+
+    def handle_item(self, item: Model):
+        """Calls the function with a single-item batch.
+
+        Args:
+            item: The model instance, or its primary key, being processed.
+        """
+        self.handle_batch([item])
@@ -0,0 +1,179 @@
+"""Provides an admin action that calls a function in a pool of processes."""
+
+from __future__ import annotations
+
+import contextlib
+import math
+import multiprocessing
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Literal
+
+import django
+from django.apps import apps
+from django.db import close_old_connections
+from django.db.models import QuerySet
+
+from action_hero.actions.simple import SimpleAction
+from action_hero.lib import Function, RunResult, item_pk
+from action_hero.progress import Progress
+
+__all__ = ["ProcessPoolAction"]
+
+
+def _init_worker() -> None:
+    """Prepares a freshly started worker process to use Django."""
+    if not apps.ready:
+        django.setup()
+
+
+def _call_each(function: Function, pks: list[Any]) -> list[tuple[Any, Exception]]:
+    """Calls ``function`` for each primary key inside a worker process.
+
+    Returns the primary keys that raised an exception, with the exception.
+    """
+    failures: list[tuple[Any, Exception]] = []
+    for pk in pks:
+        try:
+            function(pk)
+        except Exception as e:  # noqa: BLE001
+            failures.append((pk, e))
+    close_old_connections()
+    return failures
+
+
+class ProcessPoolAction(SimpleAction):
+    """Generates an admin action calling a function in worker processes.
+
+    Like ``SimpleAction``, the function is called with the primary key of each
+    record, but the calls are spread over up to ``max_workers`` processes. This
+    suits CPU-bound functions, like rendering thumbnails or PDFs, that threads
+    can't run in parallel.
+
+    The function must be importable (defined at module level) so it can be
+    sent to the workers, and it should fetch whatever it needs by primary key.
+    Worker processes are started fresh for each run, set up Django themselves,
+    and open their own database connections; the admin process's connections
+    are never shared with them. A deferred run keeps one pool for all of its
+    chunks.
+
+    Like ``ThreadPoolAction``, failed records are counted and reported
+    alongside the successful ones, unless ``on_error="raise"`` is given.
+    Return values of the function are discarded.
+
+    Example usage::
+
+        # thumbnails.py
+        def render_thumbnail(photo_pk):
+            photo = Photo.objects.get(pk=photo_pk)
+            ...
+
+        thumbnail_action = ProcessPoolAction(render_thumbnail, max_workers=4)
+    """
+
+    __slots__ = ("_local", "max_workers", "start_method")
+
+    pk_only = True
+    default_on_error = "skip"
+
+    def handle_batch(self, items: list[Any]) -> list[tuple[Any, Exception]]:
+        """Spreads the batch's primary keys over the worker processes.
+
+        Args:
+            items: The model instances, or their primary keys, being processed.
+
+        Returns:
+            The primary keys that raised an exception, with the exception.
+        """
+        pks = [item_pk(item) for item in items]
+        # A few slices per worker keeps them busy without one message per key
+        size = math.ceil(len(pks) / (self.max_workers * 4))
+        slices = [pks[start : start + size] for start in range(0, len(pks), size)]
+
+        executor = getattr(self._local, "executor", None)
+        if executor is None:  # handle_batch was called outside of run()
+            with self._executor() as executor:
+                return self._gather(executor, slices)
+        return self._gather(executor, slices)
+
+    def run(self, queryset: QuerySet, progress: Progress | None = None) -> RunResult:
+        """Runs the action with one pool of worker processes for all batches.
+
+        The pool of an enclosing ``self.run_context`` is reused.
+
+        Args:
+            queryset: The queryset of records to process.
+            progress: The run's progress. See ``AdminActionBaseClass.run``.
+        """
+        with self.run_context():
+            return super().run(queryset, progress=progress)
+
+    @contextlib.contextmanager
+    def run_context(self) -> Iterator[None]:
+        """Keeps one pool of worker processes open while the block runs, so
+        every ``self.run`` call in it shares the pool."""
+        if getattr(self._local, "executor", None) is not None:
+            yield
+            return
+        with self._executor() as executor:
+            self._local.executor = executor
+            try:
+                yield
+            finally:
+                del self._local.executor
+
+    def _executor(self) -> ProcessPoolExecutor:
+        """Creates a pool of worker processes."""
+        return ProcessPoolExecutor(
+            self.max_workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_init_worker,
+        )
+
+    def _gather(
+        self, executor: ProcessPoolExecutor, slices: list[list[Any]]
+    ) -> list[tuple[Any, Exception]]:
+        """Submits each slice of primary keys and collects their failures."""
+        futures = [executor.submit(_call_each, self.function, pks) for pks in slices]
+        failures: list[tuple[Any, Exception]] = []
+        for pks, future in zip(slices, futures, strict=True):
+            try:
+                failures.extend(future.result())
+            except Exception as e:  # noqa: BLE001
+                # The whole slice was lost, e.g. to an unpicklable exception
+                failures.extend((pk, e) for pk in pks)
+        return failures
+
+    def __init__(
+        self,
+        function: Function,
+        *,
+        max_workers: int | None = None,
+        start_method: Literal["spawn", "forkserver"] = "spawn",
+        **options: Any,
+    ):
+        """Initializes the action with a function and a pool size.
+
+        Args:
+            function: Importable callable that takes a model instance's primary
+                key.
+            max_workers: Maximum number of worker processes. Defaults to the
+                number of CPUs.
+            start_method: How worker processes are started. ``"fork"`` is not
+                allowed, because forked workers would inherit the admin
+                process's open database connections.
+            options: Any other options of ``AdminActionBaseClass``.
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("The max_workers must be a positive integer.")
+        if options.get("atomic"):
+            raise ValueError("Transactions can't span the pool's processes.")
+        if options.get("throttle"):
+            raise ValueError("A throttle can't span the pool's processes.")
+        if start_method not in ("spawn", "forkserver"):
+            raise ValueError(f"Unsupported start method: {start_method!r}")
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.start_method = start_method
+        self._local = threading.local()
+        super().__init__(function, **options)
@@ -0,0 +1,183 @@
+"""Provides an admin action that calls a function with the whole queryset."""
+
+from __future__ import annotations
+
+import contextlib
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from django.contrib import messages
+from django.contrib.admin import ModelAdmin
+from django.db import transaction
+from django.db.models import Model, QuerySet
+from django.http import HttpRequest, HttpResponse
+
+from action_hero.lib import (
+    AdminActionBaseClass,
+    FilterCondition,
+    RunResult,
+)
+from action_hero.metrics import RunMetrics
+from action_hero.progress import Progress
+
+__all__ = ["QuerySetAction", "RowLimitExceeded", "SetFunction"]
+
+# A callable that works on a queryset as a whole.
+type SetFunction = Callable[[QuerySet[Any]], int | None]
+
+
+class RowLimitExceeded(ValueError):
+    """Raised when more rows are selected than a ``QuerySetAction`` allows."""
+
+
+class QuerySetAction(AdminActionBaseClass):
+    """Generates an admin action calling a function with the selected queryset.
+
+    Instead of iterating over the records, ``QuerySetAction`` calls
+    ``function`` once with the filtered queryset, so the work can be done as a
+    set operation in the database, like a single ``UPDATE`` or an
+    ``INSERT ... SELECT``. No rows are loaded into the app: only a ``COUNT``
+    query runs before the function. This suits "select all" on a changelist
+    with many pages.
+
+    The function may return the number of rows it changed, like
+    ``queryset.update()`` does; otherwise the selected rows count as
+    processed.
+
+    Example usage::
+
+        archive_action = QuerySetAction(
+            lambda queryset: queryset.update(archived=True),
+            name="archive",
+            condition=Q(archived=False),
+            max_rows=1_000_000,
+        )
+
+        class MyModelAdmin(admin.ModelAdmin):
+            actions = [archive_action]
+            model = MyModel
+
+    Only ``Q`` objects and expressions can be used as conditions, because a
+    callable would have to load every row.
+    """
+
+    __slots__ = ("max_rows",)
+
+    function: SetFunction
+
+    def handle_item(self, item: Model):
+        """Calls the function with a queryset of the given item only.
+
+        Args:
+            item: The model instance being processed.
+        """
+        self.function(type(item)._base_manager.filter(pk=item.pk))
+
+    def run(
+        self, queryset: QuerySet[Model], progress: Progress | None = None
+    ) -> RunResult:
+        """Calls the function once with the filtered ``queryset``.
+
+        Args:
+            queryset: The queryset of records to process.
+            progress: The run's progress, saved to ``self.progress_store``
+                when the function returns.
+
+        Raises:
+            RowLimitExceeded: If more than ``self.max_rows`` rows are selected.
+        """
+        queryset = self.get_queryset(queryset)
+        started = time.perf_counter()
+
+        count = queryset.count()
+        if self.max_rows is not None and count > self.max_rows:
+            raise RowLimitExceeded(
+                f"{count} rows are selected; {self.__name__} allows at most "
+                f"{self.max_rows}."
+            )
+
+        with (
+            transaction.atomic(using=queryset.db)
+            if self.atomic
+            else contextlib.nullcontext(),
+            self.throttled(),
+        ):
+            rows = self.function(queryset)
+        result = RunResult(processed=rows if isinstance(rows, int) else count)
+
+        if progress is not None and self.progress_store is not None:
+            progress.processed += result.processed
+            self.progress_store.save(progress)
+        if self.metrics is not None:
+            metrics = RunMetrics(self.name, queryset.model._meta.label)
+            metrics.total_seconds = time.perf_counter() - started
+            metrics.processed = result.processed
+            self.metrics.record(metrics)
+        return result
+
+    def __call__(
+        self, modeladmin: ModelAdmin, request: HttpRequest, queryset: QuerySet[Model]
+    ) -> HttpResponse | None:
+        """Runs the action for ``queryset`` and tells the user how it went.
+
+        If more rows are selected than ``self.max_rows``, nothing is changed
+        and the user is told why.
+
+        Args:
+            modeladmin: The admin instance for the model being processed.
+            request: The current HTTP request object.
+            queryset: The queryset of records to process.
+        """
+        try:
+            return super().__call__(modeladmin, request, queryset)
+        except RowLimitExceeded as e:
+            modeladmin.message_user(request, str(e), messages.ERROR)
+            return None
+
+    def __init__(
+        self,
+        function: SetFunction,
+        *,
+        condition: FilterCondition | Sequence[FilterCondition] | None = None,
+        max_rows: int | None = None,
+        **options: Any,
+    ) -> None:
+        """Initializes the action with a function and an optional row limit.
+
+        Args:
+            function: Callable that takes the filtered queryset and optionally
+                returns the number of rows it changed.
+            condition: A ``Q`` object or expression to filter the queryset
+                with, or a list of them.
+            max_rows: Refuse to run when more rows than this are selected.
+            options: Any other options of ``AdminActionBaseClass``, except the
+                ones that only make sense row by row: ``chunk_size``,
+                ``backend``, ``on_error``, ``query_budget`` and
+                ``batch_condition``.
+
+        Raises:
+            TypeError: If a condition is a callable.
+            ValueError: If ``max_rows`` isn't positive or a row-by-row option
+                is given.
+        """
+        conditions = condition if isinstance(condition, (list, tuple)) else [condition]
+        if any(callable(check) for check in conditions):
+            raise TypeError(
+                "QuerySetAction only supports Q objects and expressions as conditions."
+            )
+        if max_rows is not None and max_rows < 1:
+            raise ValueError("The max_rows must be a positive integer.")
+        for option in (
+            "chunk_size",
+            "backend",
+            "on_error",
+            "query_budget",
+            "batch_condition",
+        ):
+            if options.get(option) is not None:
+                raise ValueError(f"QuerySetAction doesn't support {option}.")
+        atomic = options.pop("atomic", False)  # One call, so no chunk_size needed
+        self.max_rows = max_rows
+        super().__init__(function, condition=condition, **options)
+        self.atomic = atomic
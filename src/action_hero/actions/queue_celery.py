@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+from typing import Any, Literal
+
 from django.db.models import Model
 
 # Guard import for Celery integration
@@ -13,9 +16,68 @@ except ImportError as e:
         "it with: pip install django-admin-action-hero[celery]"
     ) from e
 
-from action_hero.lib import AdminActionBaseClass, Condition
+from action_hero.dedup import DedupBackend
+from action_hero.lib import (
+    AdminActionBaseClass,
+    Condition,
+    FilterCondition,
+    item_pk,
+)
+
+__all__ = [
+    "DEFAULT_BATCH_SIZE",
+    "DEFAULT_DEDUP_TTL",
+    "Dispatch",
+    "PkFormat",
+    "QueueCeleryAction",
+    "compress_pks",
+    "expand_pks",
+]
+
+# How tasks are published to the broker.
+type Dispatch = Literal["delay", "group", "batch"]
+# How a batch of primary keys is passed to a task with ``dispatch="batch"``.
+type PkFormat = Literal["list", "ranges"]
+
+#: Default number of primary keys sent to each task with ``dispatch="batch"``.
+DEFAULT_BATCH_SIZE = 500
+
+#: Default number of seconds a record stays claimed with ``dedup``.
+DEFAULT_DEDUP_TTL = 5 * 60
+
+
+def compress_pks(pks: Sequence[int]) -> list[list[int]]:
+    """Compresses integer primary keys into inclusive ``[first, last]`` ranges.
+
+    Runs of consecutive keys collapse into a single pair, so a selection like
+    ``[1, 2, 3, 7, 8]`` becomes ``[[1, 3], [7, 8]]``.
+
+    Args:
+        pks: The primary keys to compress.
+
+    Raises:
+        TypeError: If any primary key is not an integer.
+    """
+    ranges: list[list[int]] = []
+    for pk in sorted(pks):
+        if not isinstance(pk, int):
+            raise TypeError(f"Only integer primary keys can be ranged. Got {pk!r}")
+        if ranges and pk == ranges[-1][1] + 1:
+            ranges[-1][1] = pk
+        else:
+            ranges.append([pk, pk])
+    return ranges
 
-__all__ = ["QueueCeleryAction"]
+
+def expand_pks(ranges: Sequence[Sequence[int]]) -> list[int]:
+    """Expands ranges made by :py:func:`compress_pks` back into primary keys.
+
+    Use this in a task that receives ``pk_format="ranges"`` batches.
+
+    Args:
+        ranges: Inclusive ``[first, last]`` pairs.
+    """
+    return [pk for first, last in ranges for pk in range(first, last + 1)]
 
 
 class QueueCeleryAction(AdminActionBaseClass):
@@ -38,25 +100,146 @@ class QueueCeleryAction(AdminActionBaseClass):
         class MyModelAdmin(admin.ModelAdmin):
             actions = [conditional_action, QueueCeleryAction(...), another_action]
             model = MyModel
+
+    By default every record is queued with its own ``task.delay()`` call. Pass
+    ``dispatch="group"`` to publish each batch of records as a single
+    ``celery.group``, which sends all of the batch's messages over one producer
+    connection instead of one round-trip per record.
+
+    Pass ``dispatch="batch"`` to queue a single task per batch instead. The task
+    then receives the batch's primary keys, either as a list or, with
+    ``pk_format="ranges"``, as ranges made by :py:func:`compress_pks`::
+
+        @celery.task
+        def my_batch_task(record_ids):
+            MyModel.objects.filter(pk__in=record_ids).update(...)
+
+        batch_action = QueueCeleryAction(my_batch_task, dispatch="batch")
+
+    Batches hold ``chunk_size`` records, or ``DEFAULT_BATCH_SIZE`` if it is not
+    set.
+
+    Pass a ``dedup`` backend to skip records that were queued for the same task
+    within the last ``dedup_ttl`` seconds, like after a double-click or when
+    two admins select overlapping rows::
+
+        dedup_action = QueueCeleryAction(my_celery_task, dedup=CacheDedupBackend())
     """
 
+    __slots__ = ("dedup", "dedup_ttl", "dispatch", "pk_format")
+
     function: celery.Task
+    pk_only = True
+    skipped_label = "already queued, skipped"
 
     def handle_item(self, item: Model):
         """Queues the Celery task for the given item.
 
         Args:
-            item: The model instance being processed.
+            item: The model instance, or its primary key, being processed.
+        """
+        self.function.delay(item_pk(item))
+
+    def dedup_key(self, item: Any) -> str:
+        """Returns the key that ``self.dedup`` claims for an item.
+
+        Args:
+            item: The model instance, or its primary key, being processed.
+        """
+        return f"{self.function.name}:{item_pk(item)}"
+
+    def filter_batch(self, items: list[Any]) -> list[Any]:
+        """Drops the items that are already queued for the task, if ``dedup``
+        is set, and claims the rest.
+
+        Args:
+            items: The model instances, or their primary keys, that passed the
+                condition.
+        """
+        if self.dedup is None:
+            return items
+        keys = [self.dedup_key(item) for item in items]
+        claimed = self.dedup.claim(keys, self.dedup_ttl)
+        return [item for item, key in zip(items, keys) if key in claimed]
+
+    def handle_batch(self, items: list[Any]) -> list[tuple[Any, Exception]] | None:
+        """Queues the Celery task for a batch of items.
+
+        With ``dispatch="group"``, the whole batch is published at once as a
+        ``celery.group``. With ``dispatch="batch"``, a single task is queued
+        with every primary key in the batch. Otherwise each item is queued
+        individually.
+
+        Items that couldn't be queued are released from ``self.dedup``. If
+        queuing raises, only the items that weren't published yet are
+        released, so those already queued aren't queued again by the next run.
+
+        Args:
+            items: The model instances, or their primary keys, being processed.
+        """
+        queued: list[Any] = []
+        try:
+            failures = self._queue_batch(items, queued)
+        except Exception:
+            if self.dedup is not None:
+                published = {self.dedup_key(item) for item in queued}
+                self.dedup.release(
+                    key for key in map(self.dedup_key, items) if key not in published
+                )
+            raise
+        if failures and self.dedup is not None:
+            self.dedup.release(self.dedup_key(item) for item, _ in failures)
+        return failures
+
+    def _queue_batch(
+        self, items: list[Any], queued: list[Any]
+    ) -> list[tuple[Any, Exception]] | None:
+        """Queues the Celery task for a batch of items. See ``handle_batch``.
+
+        Args:
+            items: The model instances, or their primary keys, being processed.
+            queued: Each item is appended to it once it is published.
         """
-        self.function.delay(item.pk)
+        if self.dispatch == "group":
+            with self.throttled(len(items)):
+                celery.group(
+                    self.function.s(item_pk(item)) for item in items
+                ).apply_async()
+            queued.extend(items)
+        elif self.dispatch == "batch":
+            pks = [item_pk(item) for item in items]
+            with self.throttled():
+                if self.pk_format == "ranges":
+                    self.function.delay(compress_pks(pks))
+                else:
+                    self.function.delay(pks)
+            queued.extend(items)
+        else:
+            failures: list[tuple[Any, Exception]] = []
+            for item in items:
+                failed = super().handle_batch([item])
+                if failed:
+                    failures.extend(failed)
+                else:
+                    queued.append(item)
+            return failures
 
     def __init__(
         self,
         task: celery.Task,  # Not just any function.
         *,
-        condition: Condition | None = None,
+        condition: Condition
+        | FilterCondition
+        | Sequence[Condition | FilterCondition]
+        | None = None,
         name: str | None = None,
         short_description: str | None = None,
+        chunk_size: int | None = None,
+        dispatch: Dispatch = "delay",
+        pk_format: PkFormat = "list",
+        dedup: DedupBackend | None = None,
+        dedup_ttl: float = DEFAULT_DEDUP_TTL,
+        **options: Any,
     ) -> None:
         """Initializes the action with a Celery task and an optional condition.
 
@@ -64,17 +247,50 @@ class QueueCeleryAction(AdminActionBaseClass):
             task: Should be a Celery Task callable that takes a single model
                 instance's primary key as an argument.
             condition: A callable that takes a model instance and returns a
-                Boolean indicating whether to queue the task for that record.
+                Boolean indicating whether to queue the task for that record,
+                a ``Q`` object or expression to filter the queryset with, or a
+                list of both.
             name: The action's name in the admin. If it is omitted, the name
                 of the task will be used instead.
             short_description: The action's name displayed in the admin.
               Overrides ``name``.
+            chunk_size: Number of records to fetch from the database at a
+                time. If omitted, the whole queryset is loaded at once.
+            dispatch: ``"delay"`` to queue one task per record as it is
+                handled, ``"group"`` to publish each batch of ``chunk_size``
+                records together, or ``"batch"`` to queue one task per batch
+                with a list of primary keys.
+            pk_format: How ``dispatch="batch"`` passes primary keys to the
+                task: ``"list"`` or compact ``"ranges"``.
+            dedup: Remembers which records were queued, so they aren't queued
+                again for ``dedup_ttl`` seconds. Skipped records aren't
+                reported as failures.
+            dedup_ttl: How long, in seconds, a queued record is remembered.
+                Make it about as long as the task takes to run.
+            options: Any other options of ``AdminActionBaseClass``, like
+                ``backend``.
         """
         if not isinstance(task, (celery.Task,)):
             raise TypeError(f"The task must be a Celery task. Got {type(task)}")
+        if dispatch not in ("delay", "group", "batch"):
+            raise ValueError(f"Unknown dispatch mode: {dispatch!r}")
+        if pk_format not in ("list", "ranges"):
+            raise ValueError(f"Unknown pk format: {pk_format!r}")
+        if dedup is not None and not isinstance(dedup, DedupBackend):
+            raise TypeError("The dedup backend must be a DedupBackend.")
+        if dedup_ttl <= 0:
+            raise ValueError("The dedup_ttl must be positive.")
+        if dispatch == "batch" and chunk_size is None:
+            chunk_size = DEFAULT_BATCH_SIZE
+        self.dispatch = dispatch
+        self.pk_format = pk_format
+        self.dedup = dedup
+        self.dedup_ttl = dedup_ttl
         super().__init__(
             function=task,
             condition=condition,
             name=name or task.name,
             short_description=short_description,
+            chunk_size=chunk_size,
+            **options,
         )  # Note that `task` ends here. Use `self.function` in other methods.
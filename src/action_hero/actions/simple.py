@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from django.db.models import Model
 
-from action_hero.lib import AdminActionBaseClass
+from action_hero.lib import AdminActionBaseClass, item_pk
 
 __all__ = ["SimpleAction"]
 
@@ -29,10 +29,14 @@ class SimpleAction(AdminActionBaseClass):
     this doesn't involve a database write, the change is immediately discarded.
     """
 
+    __slots__ = ()
+
+    pk_only = True
+
     def handle_item(self, item: Model):
         """Handles a single item from the queryset.
 
         Args:
-            item: The model instance being processed.
+            item: The model instance, or its primary key, being processed.
         """
-        self.function(item.pk)
+        self.function(item_pk(item))
@@ -0,0 +1,95 @@
+"""Provides an admin action that calls a function in a pool of threads."""
+
+from __future__ import annotations
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from django.db import connections
+
+from action_hero.actions.simple import SimpleAction
+from action_hero.lib import Function
+
+__all__ = ["ThreadPoolAction"]
+
+
+class ThreadPoolAction(SimpleAction):
+    """Generates an admin action calling a function concurrently in threads.
+
+    Like ``SimpleAction``, the function is called with the primary key of each
+    record, but up to ``max_workers`` calls run at the same time. This suits
+    I/O-bound functions, like ones calling slow external HTTP APIs.
+
+    An exception in one call doesn't stop the others. Failed records are
+    counted and reported alongside the successful ones when the action ends.
+    Pass ``on_error="raise"`` to stop the run after a batch with failures
+    instead.
+
+    Each thread opens its own database connections, which are closed when the
+    thread runs out of work.
+
+    Example usage::
+
+        sync_action = ThreadPoolAction(push_to_crm, max_workers=8)
+
+        class MyModelAdmin(admin.ModelAdmin):
+            actions = [sync_action]
+            model = MyModel
+    """
+
+    __slots__ = ("max_workers",)
+
+    pk_only = True
+    default_on_error = "skip"
+
+    def handle_batch(self, items: list[Any]) -> list[tuple[Any, Exception]]:
+        """Calls ``self.handle_item`` for every item across the thread pool.
+
+        Args:
+            items: The model instances, or their primary keys, being processed.
+
+        Returns:
+            The items that raised an exception, with the exception.
+        """
+        pending: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        for item in items:
+            pending.put(item)
+        failures: list[tuple[Any, Exception]] = []
+
+        def _work() -> None:
+            try:
+                while True:
+                    try:
+                        item = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        with self.throttled():
+                            self.handle_item(item)
+                    except Exception as e:  # noqa: BLE001
+                        failures.append((item, e))
+            finally:
+                connections.close_all()  # Connections belong to this thread
+
+        workers = min(self.max_workers, len(items))
+        with ThreadPoolExecutor(workers, thread_name_prefix=self.name) as executor:
+            for future in [executor.submit(_work) for _ in range(workers)]:
+                future.result()
+
+        return failures
+
+    def __init__(self, function: Function, *, max_workers: int = 4, **options: Any):
+        """Initializes the action with a function and a pool size.
+
+        Args:
+            function: Callable that takes a model instance's primary key.
+            max_workers: Maximum number of concurrent calls to ``function``.
+            options: Any other options of ``AdminActionBaseClass``.
+        """
+        if max_workers < 1:
+            raise ValueError("The max_workers must be a positive integer.")
+        if options.get("atomic"):
+            raise ValueError("Transactions can't span the pool's threads.")
+        self.max_workers = max_workers
+        super().__init__(function, **options)
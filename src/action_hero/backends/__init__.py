@@ -0,0 +1,36 @@
+# Backends are imported on first use, so importing this package doesn't import
+# Celery in processes that never use it.
+import importlib
+import importlib.util
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .local import InlineBackend, ThreadBackend
+    from .queue_celery import CeleryBackend  # noqa: F401
+
+_modules = {
+    "CeleryBackend": ".queue_celery",
+    "InlineBackend": ".local",
+    "ThreadBackend": ".local",
+}
+
+__all__ = [
+    "InlineBackend",
+    "ThreadBackend",
+]
+
+# Guard export for Celery integration, without importing it
+if importlib.util.find_spec("celery") is not None:
+    __all__.append("CeleryBackend")
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_modules[name], __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,83 @@
+"""Provides deferred backends that run actions in the current process."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from django.db import connections
+
+from action_hero.lib import DeferredBackend, run_deferred
+
+__all__ = ["InlineBackend", "ThreadBackend"]
+
+
+class InlineBackend(DeferredBackend):
+    """Runs deferred actions immediately, inside the admin request.
+
+    This is a stand-in for a real backend, useful in tests and local
+    development where no worker is running. The admin still shows the
+    "started in the background" message.
+    """
+
+    def submit(
+        self,
+        action_name: str,
+        model_label: str,
+        pks: list[Any],
+        run_id: str | None = None,
+    ) -> None:
+        """Runs the action right away.
+
+        Args:
+            action_name: The ``name`` of the action to run.
+            model_label: The ``app_label.ModelName`` of the selected records.
+            pks: The primary keys of the selected records.
+            run_id: Identifies the run.
+        """
+        run_deferred(action_name, model_label, pks, run_id)
+
+
+class ThreadBackend(DeferredBackend):
+    """Runs deferred actions in a new thread of the web process.
+
+    The thread opens its own database connections, and closes them when the
+    run is over. Runs are lost if the process exits before they finish, so
+    prefer a task queue like Celery for important work.
+    """
+
+    def submit(
+        self,
+        action_name: str,
+        model_label: str,
+        pks: list[Any],
+        run_id: str | None = None,
+    ) -> threading.Thread:
+        """Starts a thread that runs the action.
+
+        Args:
+            action_name: The ``name`` of the action to run.
+            model_label: The ``app_label.ModelName`` of the selected records.
+            pks: The primary keys of the selected records.
+            run_id: Identifies the run.
+
+        Returns:
+            The started thread.
+        """
+        thread = threading.Thread(
+            target=self._run,
+            args=(action_name, model_label, pks, run_id),
+            name=f"action_hero:{action_name}",
+        )
+        thread.start()
+        return thread
+
+    @staticmethod
+    def _run(
+        action_name: str, model_label: str, pks: list[Any], run_id: str | None
+    ) -> None:
+        """Runs the action, then closes this thread's database connections."""
+        try:
+            run_deferred(action_name, model_label, pks, run_id)
+        finally:
+            connections.close_all()
@@ -0,0 +1,75 @@
+"""Provides a deferred backend that runs actions as Celery tasks."""
+
+from __future__ import annotations
+
+from typing import Any
+
+# Guard import for Celery integration
+try:
+    import celery
+except ImportError as e:
+    raise ImportError(
+        "Celery integration requires celery to be installed. You can install "
+        "it with: pip install django-admin-action-hero[celery]"
+    ) from e
+
+from action_hero.lib import DeferredBackend, run_deferred
+
+__all__ = ["CeleryBackend", "run_deferred_task"]
+
+
+@celery.shared_task(name="action_hero.run_deferred")
+def run_deferred_task(
+    action_name: str, model_label: str, pks: list[Any], run_id: str | None = None
+) -> int:
+    """Celery task wrapping :py:func:`~action_hero.lib.run_deferred`."""
+    return run_deferred(action_name, model_label, pks, run_id)
+
+
+class CeleryBackend(DeferredBackend):
+    """Runs deferred actions in a Celery worker.
+
+    The worker must import the modules that create the deferred actions. With
+    Django's admin autodiscovery, a worker that calls ``django.setup()`` does
+    this already.
+
+    Example usage::
+
+        process_action = SimpleAction(
+            process_record,
+            backend=CeleryBackend(queue="admin"),
+        )
+    """
+
+    def __init__(self, task: celery.Task = run_deferred_task, **options: Any) -> None:
+        """Initializes the backend.
+
+        Args:
+            task: The task that calls ``run_deferred``. Defaults to the one
+                provided by this module.
+            options: Passed to ``task.apply_async``, e.g. ``queue``.
+        """
+        self.task = task
+        self.options = options
+
+    def submit(
+        self,
+        action_name: str,
+        model_label: str,
+        pks: list[Any],
+        run_id: str | None = None,
+    ) -> celery.result.AsyncResult:
+        """Queues the orchestrating task.
+
+        Args:
+            action_name: The ``name`` of the action to run.
+            model_label: The ``app_label.ModelName`` of the selected records.
+            pks: The primary keys of the selected records.
+            run_id: Identifies the run.
+
+        Returns:
+            The queued task's result.
+        """
+        return self.task.apply_async(
+            (action_name, model_label, pks, run_id), **self.options
+        )
@@ -0,0 +1,236 @@
+"""Provides a memoizing wrapper for expensive conditions."""
+
+from __future__ import annotations
+
+import abc
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from django.core.cache import caches
+
+__all__ = [
+    "CachedCondition",
+    "ConditionCache",
+    "DjangoConditionCache",
+    "LocalConditionCache",
+]
+
+
+class ConditionCache(abc.ABC):
+    """Keeps the results of a condition by key."""
+
+    @abc.abstractmethod
+    def get(self, key: str) -> bool | None:
+        """Returns the cached result for ``key``, or ``None`` if there isn't
+        one.
+
+        Args:
+            key: The cache key.
+        """
+
+    @abc.abstractmethod
+    def set(self, key: str, value: bool) -> None:
+        """Caches the result for ``key``.
+
+        Args:
+            key: The cache key.
+            value: The condition's result.
+        """
+
+
+class LocalConditionCache(ConditionCache):
+    """Keeps results in the current process, least recently used first out.
+
+    Results are shared by every run in the process, so repeated runs of an
+    action reuse them until they expire.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None) -> None:
+        """Initializes the cache.
+
+        Args:
+            maxsize: Most results to keep. The least recently used result is
+                dropped to make room.
+            ttl: Seconds a result is kept. If omitted, results are kept until
+                they are dropped to make room.
+
+        Raises:
+            ValueError: If ``maxsize`` or ``ttl`` isn't positive.
+        """
+        if maxsize < 1:
+            raise ValueError("The maxsize must be a positive integer.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("The ttl must be positive.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._results: OrderedDict[str, tuple[bool, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bool | None:
+        """Returns the cached result for ``key``, or ``None`` if there isn't
+        one or it has expired.
+
+        Args:
+            key: The cache key.
+        """
+        with self._lock:
+            try:
+                value, expires = self._results[key]
+            except KeyError:
+                return None
+            if expires <= time.monotonic():
+                del self._results[key]
+                return None
+            self._results.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bool) -> None:
+        """Caches the result for ``key``.
+
+        Args:
+            key: The cache key.
+            value: The condition's result.
+        """
+        expires = time.monotonic() + self.ttl if self.ttl else float("inf")
+        with self._lock:
+            self._results[key] = (value, expires)
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drops every result."""
+        with self._lock:
+            self._results.clear()
+
+
+class DjangoConditionCache(ConditionCache):
+    """Keeps results in one of Django's caches, so they are shared between
+    processes."""
+
+    def __init__(
+        self,
+        alias: str = "default",
+        *,
+        timeout: float | None = 300,
+        key_prefix: str = "action_hero:condition:",
+    ) -> None:
+        """Initializes the cache.
+
+        Args:
+            alias: Which cache in ``settings.CACHES`` to use.
+            timeout: Seconds a result is kept. ``None`` keeps it until the
+                cache evicts it.
+            key_prefix: Prepended to each key to make the cache key.
+        """
+        self.alias = alias
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+
+    def get(self, key: str) -> bool | None:
+        """Returns the cached result for ``key``, or ``None`` if there isn't
+        one.
+
+        Args:
+            key: The cache key.
+        """
+        return caches[self.alias].get(self.key_prefix + key)
+
+    def set(self, key: str, value: bool) -> None:
+        """Caches the result for ``key``.
+
+        Args:
+            key: The cache key.
+            value: The condition's result.
+        """
+        caches[self.alias].set(self.key_prefix + key, value, self.timeout)
+
+
+class CachedCondition:
+    """Wraps a condition so its result is cached by a key of each record.
+
+    Use it for expensive, deterministic checks whose result depends on
+    something many records share, like an entitlement looked up by a foreign
+    key. Records with a key that was already checked reuse the result, within
+    a run and across runs.
+
+    Example usage::
+
+        entitled = CachedCondition(
+            lambda record: billing.is_entitled(record.account_id),
+            key=lambda record: record.account_id,
+            cache=LocalConditionCache(maxsize=10_000, ttl=600),
+            namespace="entitled",
+        )
+        action = SimpleAction(process, condition=entitled)
+
+    The wrapper is a condition itself, so it can be listed with other
+    conditions.
+    """
+
+    def __init__(
+        self,
+        condition: Callable[[Any], bool],
+        *,
+        key: Callable[[Any], Hashable],
+        cache: ConditionCache | None = None,
+        namespace: str | None = None,
+    ) -> None:
+        """Initializes the wrapper.
+
+        Args:
+            condition: The condition to cache.
+            key: Returns the value a record's result depends on. Records with
+                equal keys must get equal results.
+            cache: Where results are kept. Defaults to a new
+                :py:class:`LocalConditionCache`.
+            namespace: Keeps the results of this condition apart from others
+                in a shared cache. Defaults to the condition's module and
+                qualified name, and is required for lambdas and functions
+                defined inside other functions, whose names aren't unique.
+
+        Raises:
+            TypeError: If ``condition`` or ``key`` isn't callable, or
+                ``cache`` isn't a ``ConditionCache``.
+            ValueError: If ``namespace`` is omitted for a lambda or a local
+                function.
+        """
+        if not callable(condition) or not callable(key):
+            raise TypeError("The condition and key must be callable.")
+        if cache is not None and not isinstance(cache, ConditionCache):
+            raise TypeError("The cache must be a ConditionCache.")
+        self.condition = condition
+        self.key = key
+        self.cache = cache if cache is not None else LocalConditionCache()
+        if not namespace:
+            owner = condition if hasattr(condition, "__qualname__") else type(condition)
+            namespace = f"{owner.__module__}.{owner.__qualname__}"
+            if "<lambda>" in namespace or "<locals>" in namespace:
+                raise ValueError(
+                    f"{namespace} isn't a unique name; give the CachedCondition "
+                    "a namespace."
+                )
+        self.namespace = namespace
+        #: Number of results found in the cache.
+        self.hits = 0
+        #: Number of results computed by the condition.
+        self.misses = 0
+
+    def __call__(self, record: Any) -> bool:
+        """Returns the condition's result for ``record``, cached by its key.
+
+        Args:
+            record: The model instance being checked.
+        """
+        cache_key = f"{self.namespace}:{self.key(record)}"
+        result = self.cache.get(cache_key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = bool(self.condition(record))
+        self.cache.set(cache_key, result)
+        return result
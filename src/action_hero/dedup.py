@@ -0,0 +1,140 @@
+"""Provides backends that remember recently queued work so it isn't queued
+twice."""
+
+from __future__ import annotations
+
+import abc
+import threading
+import time
+from collections.abc import Iterable
+
+from django.core.cache import caches
+
+__all__ = [
+    "CacheDedupBackend",
+    "DedupBackend",
+    "InMemoryDedupBackend",
+]
+
+
+class DedupBackend(abc.ABC):
+    """Keeps a set of keys for recently queued work, each for a limited time.
+
+    Give a :py:class:`~action_hero.actions.queue_celery.QueueCeleryAction` a
+    ``dedup`` backend to skip records that are already queued.
+    """
+
+    @abc.abstractmethod
+    def claim(self, keys: Iterable[str], ttl: float) -> set[str]:
+        """Claims every key that isn't already claimed, all at once.
+
+        Returns the keys that were claimed by this call. The others are still
+        held by an earlier claim.
+
+        Args:
+            keys: The keys to claim.
+            ttl: How long, in seconds, a claim lasts.
+        """
+
+    @abc.abstractmethod
+    def release(self, keys: Iterable[str]) -> None:
+        """Releases claimed keys before their time is up, e.g. because the work
+        couldn't be queued after all.
+
+        Args:
+            keys: The keys to release.
+        """
+
+
+class InMemoryDedupBackend(DedupBackend):
+    """Keeps claims in a dictionary in the current process.
+
+    Only catches duplicates queued by the same process, like a double-click
+    handled by one worker. Use :py:class:`CacheDedupBackend` across processes.
+    """
+
+    def __init__(self) -> None:
+        self._expires: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._prune_at = 1024
+
+    def claim(self, keys: Iterable[str], ttl: float) -> set[str]:
+        """Claims every key that isn't already claimed, all at once.
+
+        Args:
+            keys: The keys to claim.
+            ttl: How long, in seconds, a claim lasts.
+        """
+        now = time.monotonic()
+        claimed = set()
+        with self._lock:
+            for key in keys:
+                if self._expires.get(key, 0.0) <= now:
+                    self._expires[key] = now + ttl
+                    claimed.add(key)
+            if len(self._expires) >= self._prune_at:  # Forget expired claims
+                self._expires = {k: t for k, t in self._expires.items() if t > now}
+                self._prune_at = max(1024, 2 * len(self._expires))
+        return claimed
+
+    def release(self, keys: Iterable[str]) -> None:
+        """Releases claimed keys before their time is up.
+
+        Args:
+            keys: The keys to release.
+        """
+        with self._lock:
+            for key in keys:
+                self._expires.pop(key, None)
+
+    def clear(self) -> None:
+        """Releases every claim."""
+        with self._lock:
+            self._expires.clear()
+
+
+class CacheDedupBackend(DedupBackend):
+    """Keeps claims in one of Django's caches.
+
+    Each batch of keys is checked with one ``get_many`` and claimed with one
+    ``set_many``. The check and the claim aren't atomic, so two runs claiming
+    the same keys at the same instant may both win; it catches double-clicks
+    and overlapping selections, not every race.
+    """
+
+    def __init__(
+        self, alias: str = "default", *, key_prefix: str = "action_hero:dedup:"
+    ) -> None:
+        """Initializes the backend.
+
+        Args:
+            alias: Which cache in ``settings.CACHES`` to use.
+            key_prefix: Prepended to each key to make the cache key.
+        """
+        self.alias = alias
+        self.key_prefix = key_prefix
+
+    def claim(self, keys: Iterable[str], ttl: float) -> set[str]:
+        """Claims every key that isn't already claimed, all at once.
+
+        Args:
+            keys: The keys to claim.
+            ttl: How long, in seconds, a claim lasts.
+        """
+        cache = caches[self.alias]
+        cache_keys = {self.key_prefix + key: key for key in keys}
+        held = cache.get_many(cache_keys)
+        claimed = {
+            key for cache_key, key in cache_keys.items() if cache_key not in held
+        }
+        if claimed:
+            cache.set_many({self.key_prefix + key: 1 for key in claimed}, ttl)
+        return claimed
+
+    def release(self, keys: Iterable[str]) -> None:
+        """Releases claimed keys before their time is up.
+
+        Args:
+            keys: The keys to release.
+        """
+        caches[self.alias].delete_many([self.key_prefix + key for key in keys])
@@ -0,0 +1,100 @@
+"""Provides query counting to catch N+1 query patterns in actions."""
+
+from __future__ import annotations
+
+import warnings
+from collections.abc import Callable
+from typing import Any, Literal
+
+__all__ = [
+    "QueryBudgetExceeded",
+    "QueryBudgetWarning",
+    "QueryCounter",
+]
+
+
+class QueryBudgetWarning(RuntimeWarning):
+    """Warns that handling a single item made more queries than allowed."""
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised when handling a single item made more queries than allowed."""
+
+
+class QueryCounter:
+    """Counts the queries made while an action runs and checks each item's
+    share against a budget.
+
+    The counter is installed as an
+    :external+django:doc:`execute wrapper <topics/db/instrumentation>` on the
+    run's database connection. More queries for one item than its budget
+    usually means an N+1 pattern, like a condition reading ``record.owner``
+    without ``select_related("owner")`` on the action.
+    """
+
+    def __init__(
+        self, budget: int, on_exceed: Literal["warn", "raise"] = "warn"
+    ) -> None:
+        """Initializes the counter.
+
+        Args:
+            budget: The number of queries a single item may make in each
+                stage (the condition, and handling).
+            on_exceed: Whether to emit a :py:class:`QueryBudgetWarning` or
+                raise :py:class:`QueryBudgetExceeded` when the budget is
+                exceeded.
+        """
+        self.budget = budget
+        self.on_exceed = on_exceed
+        self.count = 0
+        self._warned: set[str] = set()
+
+    def __call__(
+        self, execute: Callable, sql: str, params: Any, many: bool, context: Any
+    ) -> Any:
+        """Counts a query, then runs it."""
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def check(self, item: Any, before: int, stage: str) -> None:
+        """Flags ``item`` if it made too many queries since ``before``.
+
+        Warnings are only emitted for the first offending item of each stage,
+        to avoid flooding the logs.
+
+        Args:
+            item: The model instance or primary key that was processed.
+            before: The value of ``self.count`` before processing started.
+            stage: What was being done, e.g. ``"condition"``.
+
+        Raises:
+            QueryBudgetExceeded: If the budget was exceeded and ``on_exceed``
+                is ``"raise"``.
+        """
+        used = self.count - before
+        if used <= self.budget:
+            return
+
+        message = (
+            f"The {stage} made {used} queries for item {getattr(item, 'pk', item)}, "
+            f"over the budget of {self.budget}. This usually means an N+1 query; "
+            f"declare select_related or prefetch_related on the action."
+        )
+        if self.on_exceed == "raise":
+            raise QueryBudgetExceeded(message)
+        if stage not in self._warned:
+            self._warned.add(stage)
+            warnings.warn(message, QueryBudgetWarning, stacklevel=2)
+
+    def counted(
+        self, condition: Callable[[Any], bool], stage: str = "condition"
+    ) -> Callable[[Any], bool]:
+        """Wraps ``condition`` so each call is checked against the budget."""
+
+        def _condition(item: Any) -> bool:
+            before = self.count
+            passed = condition(item)
+            self.check(item, before, stage)
+            return passed
+
+        return _condition
@@ -3,20 +3,276 @@
 from __future__ import annotations
 
 import abc
-from collections.abc import Callable
-from typing import Any
+import contextlib
+import csv
+import dataclasses
+import functools
+import itertools
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterator, Sequence
+from contextvars import ContextVar
+from typing import Any, Literal
 
+from django.apps import apps
 from django.contrib import messages
 from django.contrib.admin import ModelAdmin
-from django.db.models import Model, QuerySet
-from django.http import HttpRequest
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Model, Prefetch, Q, QuerySet
+from django.db.models.expressions import BaseExpression, Col, Ref
+from django.db.models.sql.datastructures import Join
+from django.db.models.sql.query import Query
+from django.http import HttpRequest, HttpResponse
+from django.urls import NoReverseMatch, reverse
+from django.utils import translation
+from django.utils.html import format_html
 
-__all__ = ["AdminActionBaseClass", "Condition", "Function"]
+from action_hero.diagnostics import QueryCounter
+from action_hero.metrics import MetricsSink, RunMetrics
+from action_hero.progress import Progress, ProgressStore
+from action_hero.throttle import Throttle
+
+__all__ = [
+    "AdminActionBaseClass",
+    "AsyncFunction",
+    "BatchCondition",
+    "Condition",
+    "DeferredBackend",
+    "ErrorPolicy",
+    "FilterCondition",
+    "Function",
+    "RunResult",
+    "item_pk",
+    "resume_deferred",
+    "run_deferred",
+]
 
 # Condition to enable the function for an item.
 type Condition = Callable[[Any], bool]
+# Condition applied by the database before any item is fetched.
+type FilterCondition = Q | BaseExpression
+# Condition checked for a chunk of rows at once, given as columns.
+type BatchCondition = Callable[[dict[str, Any]], Sequence[bool]]
 # Function to call for each item.
 type Function = Callable[[Any], None]
+# Coroutine function to await for each item.
+type AsyncFunction = Callable[[Any], Awaitable[None]]
+# What to do when handling an item raises an exception.
+type ErrorPolicy = Literal["raise", "skip", "collect"]
+
+
+#: Number of primary keys a deferred run loads at a time, unless the action
+#: has its own ``chunk_size``.
+DEFERRED_CHUNK_SIZE = 1000
+
+#: Number of rows read at a time to check a ``batch_condition``, unless the
+#: action has its own ``chunk_size``.
+BATCH_CONDITION_CHUNK_SIZE = 10_000
+
+# Actions that can be run by a deferred backend, keyed by name.
+_deferred_actions: dict[str, AdminActionBaseClass] = {}
+
+
+@dataclasses.dataclass(frozen=True)
+class _RunState:
+    """What the methods of an action need to know about the run in progress."""
+
+    # Database alias of the queryset being run, used for per-item savepoints.
+    db: str = DEFAULT_DB_ALIAS
+    # Metrics of the run, if the action has a metrics sink.
+    metrics: RunMetrics | None = None
+    # Query counter of the run, if the action has a query budget.
+    queries: QueryCounter | None = None
+
+
+_NO_RUN = _RunState()
+_current_run: ContextVar[_RunState] = ContextVar("action_hero_run")
+
+
+@functools.lru_cache(maxsize=512)
+def _model_names(model: type[Model], language: str | None) -> tuple[str, str]:
+    """Returns the title-cased singular and plural names of ``model``.
+
+    ``language`` is only part of the cache key; verbose names are translated
+    into the active language.
+    """
+    # Use the model's verbose names, or reasonable fallbacks
+    singular = model._meta.verbose_name or model.__name__
+    plural = model._meta.verbose_name_plural or model.__name__ + "s"
+    return str(singular).title(), str(plural).title()
+
+
+def _no_condition(_: Any) -> bool:
+    """The default condition; every item passes."""
+    return True
+
+
+def _filters_need_grouping(query: Query) -> bool:
+    """Returns whether a filter of ``query`` references one of its annotations
+    or a joined table, whose rows the ``GROUP BY`` may be collapsing.
+
+    Filters that can't be inspected count as referencing them.
+    """
+    annotations = list(query.annotations.values())
+    nodes = [query.where]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, Ref) or any(node is a for a in annotations):
+            return True
+        if isinstance(node, Col):
+            cols = [node]
+        elif hasattr(node, "get_external_cols"):  # A subquery
+            cols = node.get_external_cols()
+        else:
+            cols = []
+        if any(isinstance(query.alias_map.get(col.alias), Join) for col in cols):
+            return True
+        if hasattr(node, "children"):
+            nodes.extend(node.children)
+        elif hasattr(node, "get_source_expressions"):
+            nodes.extend(node.get_source_expressions())
+        else:
+            return True
+    return False
+
+
+def item_pk(item: Model | Any) -> Any:
+    """Returns the primary key of an item handed to an action.
+
+    Items are usually model instances, but actions that set ``pk_only`` may
+    receive bare primary keys instead.
+
+    Args:
+        item: A model instance or a primary key.
+    """
+    return item.pk if isinstance(item, Model) else item
+
+
+@dataclasses.dataclass
+class RunResult:
+    """The outcome of running an action over a queryset."""
+
+    #: Number of items that were handled successfully.
+    processed: int = 0
+    #: Items whose handling raised an exception, with the exception.
+    failures: list[tuple[Any, Exception]] = dataclasses.field(default_factory=list)
+    #: Number of items that passed the condition but were dropped by
+    #: ``filter_batch``.
+    skipped: int = 0
+
+    @property
+    def failed(self) -> int:
+        """Number of items whose handling raised an exception."""
+        return len(self.failures)
+
+
+def run_deferred(
+    action_name: str, model_label: str, pks: list[Any], run_id: str | None = None
+) -> int:
+    """Runs a deferred action for the given primary keys.
+
+    This is the job that a :py:class:`DeferredBackend` schedules. It looks up
+    the action by name, rebuilds the queryset from ``pks``, and processes it in
+    chunks. Returns the number of records that were handled.
+
+    If the run already has progress, e.g. because a Celery task was delivered
+    again, only the primary keys after its last checkpoint are processed.
+
+    Args:
+        action_name: The ``name`` of an action created with a ``backend``.
+        model_label: The ``app_label.ModelName`` of the selected records.
+        pks: The primary keys of the selected records.
+        run_id: Identifies the run, e.g. for progress tracking.
+
+    Raises:
+        LookupError: If no deferred action with that name has been created in
+            this process.
+    """
+    try:
+        action = _deferred_actions[action_name]
+    except KeyError:
+        raise LookupError(f"No deferred action named {action_name!r}.") from None
+
+    manager = apps.get_model(model_label)._base_manager
+    store = action.progress_store
+    size = action.chunk_size or DEFERRED_CHUNK_SIZE
+    pks = sorted(pks)  # Checkpoints are high-water marks
+    count = 0
+    with (
+        action.run_context(),
+        action.track_progress(
+            run_id or uuid.uuid4().hex, model_label, len(pks), pks=pks
+        ) as progress,
+    ):
+        if progress is not None:
+            pks = progress.remaining_pks(pks)
+        for start in range(0, len(pks), size):
+            chunk_pks = pks[start : start + size]
+            chunk = manager.filter(pk__in=chunk_pks)
+            count += action.run(chunk, progress=progress).processed
+            if progress is not None and store is not None:
+                progress.checkpoint(chunk_pks[-1])
+                store.save(progress)
+    return count
+
+
+def resume_deferred(action_name: str, run_id: str, *, force: bool = False) -> Any:
+    """Resumes a deferred run from its last checkpoint.
+
+    Use this to continue a failed run, or with ``force=True`` a run whose
+    worker was killed, e.g. from a shell or a management command. See
+    :py:meth:`AdminActionBaseClass.resume`.
+
+    Args:
+        action_name: The ``name`` of an action created with a ``backend`` and
+            a ``progress_store``.
+        run_id: Identifies the run.
+        force: Whether to resume the run even if it is still ``"running"``.
+
+    Raises:
+        LookupError: If no deferred action with that name has been created in
+            this process, or the run has no checkpoint.
+        ValueError: If the run can't be resumed.
+    """
+    try:
+        action = _deferred_actions[action_name]
+    except KeyError:
+        raise LookupError(f"No deferred action named {action_name!r}.") from None
+    return action.resume(run_id, force=force)
+
+
+class DeferredBackend(abc.ABC):
+    """Schedules deferred action runs somewhere other than the admin request.
+
+    Giving an action a ``backend`` makes the admin request capture only the
+    selected primary keys and hand them to ``submit``, so the response returns
+    right away. The backend must eventually call :py:func:`run_deferred` with
+    the same arguments, in a process where the action has been created (e.g.
+    by importing the admin modules, which Django does on startup).
+
+    See ``action_hero.backends`` for implementations.
+    """
+
+    @abc.abstractmethod
+    def submit(
+        self,
+        action_name: str,
+        model_label: str,
+        pks: list[Any],
+        run_id: str | None = None,
+    ) -> Any:
+        """Schedules a call to :py:func:`run_deferred`.
+
+        Args:
+            action_name: The ``name`` of the action to run.
+            model_label: The ``app_label.ModelName`` of the selected records.
+            pks: The primary keys of the selected records.
+            run_id: Identifies the run.
+
+        Returns:
+            Optionally, a handle to the scheduled job, like a thread or a
+            Celery ``AsyncResult``.
+        """
 
 
 class AdminActionBaseClass(abc.ABC):
@@ -55,8 +311,70 @@ class AdminActionBaseClass(abc.ABC):
 
     If you need custom behavior, subclass ``AdminActionBaseClass`` and override
     the appropriate method(s). See implementations in ``actions`` for details.
+    Declare ``__slots__`` for any attributes the subclass adds to keep its
+    instances as compact as the provided ones.
     """
 
+    # Actions are created once per admin and live for the whole process, so
+    # they don't carry a __dict__. Subclasses declare their own __slots__.
+    # allowed_permissions, locations and plural_description are optional
+    # attributes Django reads from admin actions.
+    __slots__ = (
+        "__name__",
+        "allowed_permissions",
+        "atomic",
+        "backend",
+        "batch_columns",
+        "batch_condition",
+        "batch_fields",
+        "chunk_size",
+        "clear_ordering",
+        "condition",
+        "condition_filters",
+        "defer",
+        "function",
+        "locations",
+        "metrics",
+        "name",
+        "on_error",
+        "on_query_budget",
+        "only",
+        "plural_description",
+        "prefetch_related",
+        "progress_store",
+        "query_budget",
+        "select_related",
+        "short_description",
+        "strip_annotations",
+        "throttle",
+    )
+
+    #: Set to ``True`` when ``handle_item`` only needs each item's primary key.
+    #: If there is no callable condition, the queryset is then read with
+    #: ``values_list("pk", flat=True)`` and items are bare primary keys; use
+    #: :py:func:`item_pk` to read them either way. A subclass that overrides
+    #: how items are handled gets model instances again, unless it sets
+    #: ``pk_only`` itself.
+    pk_only: bool = False
+
+    #: The failure policy used when ``on_error`` isn't given.
+    default_on_error: ErrorPolicy = "raise"
+
+    #: How the admin message describes items dropped by ``filter_batch``.
+    skipped_label: str = "skipped"
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Turns ``pk_only`` off for subclasses that override how items are
+        handled without opting in, since they may read fields of each item."""
+        super().__init_subclass__(**kwargs)
+        overrides = {
+            "handle_item",
+            "ahandle_item",
+            "handle_batch",
+        } & cls.__dict__.keys()
+        if overrides and "pk_only" not in cls.__dict__:
+            cls.pk_only = False
+
     @abc.abstractmethod
     def handle_item(self, item: Model):
         """Handles a single item from the queryset.
@@ -74,74 +392,681 @@ class AdminActionBaseClass(abc.ABC):
             item: The model instance being processed.
         """
 
-    def __call__(
+    def handle_batch(self, items: list[Any]) -> list[tuple[Any, Exception]] | None:
+        """Handles a batch of items that passed the condition.
+
+        By default this calls ``self.handle_item`` for each item. Override it
+        when the work can be expressed in bulk, like a single ``UPDATE`` or a
+        ``bulk_create``, instead of one statement per record.
+
+        Implementations that keep going after an item fails may return the
+        failed items paired with their exceptions; every other item in the
+        batch counts as processed. If the method raises instead, the whole
+        batch counts as failed.
+
+        With ``atomic=True`` the batch already runs in a transaction. When
+        failures are skipped or collected, each item then gets a savepoint of
+        its own, so a failing item's writes are rolled back without losing
+        the rest of the batch.
+
+        Args:
+            items: The model instances (or primary keys) being processed. At
+                most ``self.chunk_size`` items are passed at a time.
+        """
+        failures: list[tuple[Any, Exception]] = []
+        savepoints = self.atomic and self.on_error != "raise"
+        run = _current_run.get(_NO_RUN)
+        metrics, queries = run.metrics, run.queries
+        for item in items:
+            with self.throttled():
+                start = time.perf_counter() if metrics is not None else 0.0
+                before = queries.count if queries is not None else 0
+                try:
+                    if savepoints:
+                        with transaction.atomic(using=run.db):
+                            self.handle_item(item)
+                    else:
+                        self.handle_item(item)
+                    if queries is not None:
+                        queries.check(item, before, "handle_item")
+                except Exception as e:
+                    if self.on_error == "raise":
+                        raise
+                    failures.append((item, e))
+                finally:
+                    if metrics is not None:
+                        metrics.handle_seconds.append(time.perf_counter() - start)
+        return failures
+
+    def run_context(self) -> contextlib.AbstractContextManager[None]:
+        """Returns a context manager held open around every ``self.run`` call
+        of a deferred run, which runs each chunk of records separately.
+
+        Override it to share something costly between the chunks, like a
+        pool of workers. By default it does nothing.
+        """
+        return contextlib.nullcontext()
+
+    def throttled(self, calls: int = 1) -> contextlib.AbstractContextManager[None]:
+        """Returns a context manager holding a slot of ``self.throttle`` for
+        ``calls`` calls, or doing nothing if there is no throttle.
+
+        Wrap each call, or each bulk dispatch, in it when overriding
+        ``handle_batch``.
+
+        Args:
+            calls: Number of calls made in the block.
+        """
+        if self.throttle is None:
+            return contextlib.nullcontext()
+        return self.throttle.slot(calls)
+
+    def filter_batch(self, items: list[Any]) -> list[Any]:
+        """Returns the items of a batch that should be handled.
+
+        Called with each batch before ``self.handle_batch``. By default every
+        item is kept. Override it to drop items that turn out not to need
+        handling, like work that is already queued. Dropped items count as
+        skipped.
+
+        Args:
+            items: The model instances (or primary keys) that passed the
+                condition.
+        """
+        return items
+
+    def iter_batches(self, queryset: QuerySet[Model]) -> Iterator[list[Any]]:
+        """Yields lists of records from ``queryset`` that pass
+        ``self.condition``.
+
+        Each list holds at most ``self.chunk_size`` records. Without a
+        ``chunk_size``, every passing record is yielded in a single list.
+
+        Args:
+            queryset: The queryset of records to process.
+        """
+        batch: list[Any] = []
+        records = self.iter_records(queryset)
+        condition = self.condition
+
+        run = _current_run.get(_NO_RUN)
+        if run.queries is not None and condition is not _no_condition:
+            condition = run.queries.counted(condition)
+        if run.metrics is not None:
+            records = run.metrics.timed_records(records)
+            condition = run.metrics.timed_condition(condition)
+
+        for record in records:
+            if not condition(record):  # Skip records failing the condition
+                continue
+            batch.append(record)
+            if self.chunk_size and len(batch) >= self.chunk_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    def get_queryset(self, queryset: QuerySet[Model]) -> QuerySet[Model]:
+        """Returns the queryset that will actually be iterated.
+
+        Any ``Q`` objects or expressions given as the condition are applied
+        here with ``queryset.filter()``, so rejected rows are never fetched.
+        The action's ``select_related`` and ``prefetch_related`` are applied
+        too, so related objects are fetched with the records, as are its
+        ``only`` and ``defer`` fields and ordering and annotation options.
+
+        Args:
+            queryset: The queryset of records selected in the admin.
+        """
+        if self.strip_annotations and queryset.query.annotations:
+            queryset = self._without_annotations(queryset)
+        if self.condition_filters:
+            queryset = queryset.filter(*self.condition_filters)
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.only:
+            queryset = queryset.only(*self.only)
+        if self.defer:
+            queryset = queryset.defer(*self.defer)
+        if self.clear_ordering:
+            queryset = queryset.order_by()
+        return queryset
+
+    def _without_annotations(self, queryset: QuerySet[Model]) -> QuerySet[Model]:
+        """Returns a queryset of the same rows as ``queryset``, without its
+        annotations.
+
+        Usually the annotations are dropped from a clone, along with the joins
+        and ``GROUP BY`` they need. If a filter references an annotation or a
+        joined table, the rows are selected with a ``pk__in`` subquery
+        instead, so the filter still applies to the same rows. Ordering that
+        doesn't depend on an annotation is kept.
+        """
+        annotations = queryset.query.annotations
+        ordering = [
+            field
+            for field in queryset.query.order_by
+            if isinstance(field, str) and field.lstrip("-") not in annotations
+        ]
+        if _filters_need_grouping(queryset.query):
+            stripped = queryset.model._base_manager.db_manager(queryset.db).filter(
+                pk__in=queryset.values("pk")
+            )
+            return stripped.order_by(*ordering) if ordering else stripped
+
+        stripped = queryset.order_by(*ordering)
+        query = stripped.query
+        query.annotations = {}
+        query.set_annotation_mask(None)
+        query.group_by = None
+        for alias, table in query.alias_map.items():
+            if isinstance(table, Join):  # Only the annotations used joins
+                query.alias_refcount[alias] = 0
+        return stripped
+
+    def iter_records(self, queryset: QuerySet[Model]) -> Iterator[Any]:
+        """Yields the records of ``queryset`` that should be considered.
+
+        When ``self.chunk_size`` is set, the queryset is streamed with
+        :external+django:py:meth:`~django.db.models.query.QuerySet.iterator`
+        so only one chunk of model instances is held in memory at a time.
+        Otherwise the queryset is evaluated (and cached) as usual.
+
+        If ``self.pk_only`` is set and there is no callable condition, only
+        primary keys are fetched and yielded.
+
+        Args:
+            queryset: The queryset of records to process.
+        """
+        if self.batch_condition is not None:
+            return self.iter_masked_records(queryset)
+
+        if self.pk_only and self.condition is _no_condition:
+            queryset = queryset.values_list("pk", flat=True)
+
+        if self.chunk_size:
+            return queryset.iterator(chunk_size=self.chunk_size)
+        return iter(queryset)
+
+    def iter_masked_records(self, queryset: QuerySet[Model]) -> Iterator[Any]:
+        """Yields the records of ``queryset`` that pass
+        ``self.batch_condition``.
+
+        Rows are read in chunks with ``values_list``, holding only the primary
+        key and ``self.batch_fields``. Each chunk is passed to the batch
+        condition as a dictionary of columns, keyed by field name, with the
+        primary keys under ``"pk"``. The condition returns one Boolean per
+        row. Model instances are only loaded for the rows that pass, and only
+        if ``self.pk_only`` isn't set or there is a callable condition.
+
+        Args:
+            queryset: The queryset of records to process.
+        """
+        batch_condition = self.batch_condition
+        if batch_condition is None:
+            raise ValueError("The action has no batch_condition.")
+
+        fields = ["pk", *self.batch_fields]
+        size = self.chunk_size or BATCH_CONDITION_CHUNK_SIZE
+        rows = queryset.values_list(*fields).iterator(chunk_size=size)
+        load = not self.pk_only or self.condition is not _no_condition
+        metrics = _current_run.get(_NO_RUN).metrics
+
+        for chunk in itertools.batched(rows, size):
+            start = time.perf_counter()
+            columns = dict(zip(fields, map(list, zip(*chunk, strict=True))))
+            if self.batch_columns == "numpy":
+                import numpy  # Checked by __init__
+
+                columns = {name: numpy.asarray(col) for name, col in columns.items()}
+            mask = batch_condition(columns)
+            pks = [row[0] for row, keep in zip(chunk, mask, strict=True) if keep]
+            if metrics is not None:
+                metrics.condition_seconds += time.perf_counter() - start
+                metrics.skipped += len(chunk) - len(pks)
+
+            if not load:
+                yield from pks
+            elif pks:
+                instances = queryset.in_bulk(pks)
+                yield from (instances[pk] for pk in pks if pk in instances)
+
+    def get_model_name(self, model: type[Model], count: int) -> str:
+        """Returns the title-cased name for ``count`` records of ``model``.
+
+        Names are computed once per model and language.
+
+        Args:
+            model: The model class of the processed records.
+            count: The number of processed records.
+        """
+        singular, plural = _model_names(model, translation.get_language())
+        return singular if count == 1 else plural
+
+    @contextlib.contextmanager
+    def track_progress(
+        self,
+        run_id: str,
+        model_label: str,
+        total: int,
+        pks: list[Any] | None = None,
+    ) -> Iterator[Progress | None]:
+        """Saves the progress of a run to ``self.progress_store`` as it starts
+        and as it finishes or fails.
+
+        Yields the run's :py:class:`~action_hero.progress.Progress` to pass to
+        ``self.run``, or ``None`` if the action has no progress store. If the
+        store already has progress for ``run_id``, e.g. because the run is
+        being resumed or its job was delivered again, it carries on from the
+        last checkpoint: the counts go back to what they were then.
+
+        Args:
+            run_id: Identifies the run.
+            model_label: The ``app_label.ModelName`` of the selected records.
+            total: The number of selected records.
+            pks: The selected primary keys, sorted, to make the run resumable.
+                They are saved only if the store has no progress for the run
+                yet.
+        """
+        store = self.progress_store
+        if store is None:
+            yield None
+            return
+
+        progress = store.get(run_id)
+        if progress is None:
+            progress = Progress(
+                run_id, self.name, model_label, total, checkpointed=pks is not None
+            )
+            if pks is not None:
+                store.save_pks(run_id, pks)
+        else:
+            progress.processed = progress.checkpoint_processed
+            progress.failed = progress.checkpoint_failed
+        progress.status = "running"
+        store.save(progress)
+        try:
+            yield progress
+        except BaseException:
+            progress.status = "failed"
+            store.save(progress)
+            raise
+        progress.status = "finished"
+        store.save(progress)
+
+    def progress_url(self, modeladmin: ModelAdmin, run_id: str) -> str | None:
+        """Returns the URL of a run's progress page, if the admin has one.
+
+        See :py:class:`~action_hero.progress.ProgressAdminMixin`.
+
+        Args:
+            modeladmin: The admin instance for the model being processed.
+            run_id: Identifies the run.
+        """
+        if self.progress_store is None:
+            return None
+        opts = modeladmin.model._meta
+        try:
+            url = reverse(
+                f"{modeladmin.admin_site.name}:"
+                f"{opts.app_label}_{opts.model_name}_action_progress",
+                args=[run_id],
+            )
+        except NoReverseMatch:
+            return None
+        return f"{url}?format=html"
+
+    def run(
+        self, queryset: QuerySet[Model], progress: Progress | None = None
+    ) -> RunResult:
+        """Calls ``self.handle_batch`` for each batch of items in ``queryset``
+        that pass ``self.condition``.
+
+        Args:
+            queryset: The queryset of records to process.
+            progress: The run's progress, saved to ``self.progress_store``
+                after each batch. See ``self.track_progress``.
+        """
+        result = RunResult()
+        queryset = self.get_queryset(queryset)
+        store, sink = self.progress_store, self.metrics
+        metrics = queries = None
+        if sink is not None:
+            metrics = RunMetrics(self.name, queryset.model._meta.label)
+        if self.query_budget is not None:
+            queries = QueryCounter(self.query_budget, self.on_query_budget)
+        started = time.perf_counter()
+        token = _current_run.set(_RunState(queryset.db, metrics, queries))
+
+        try:
+            with contextlib.ExitStack() as stack:
+                if queries is not None:
+                    db = connections[queryset.db]
+                    stack.enter_context(db.execute_wrapper(queries))
+                for batch in self.iter_batches(queryset):
+                    batch_started = time.perf_counter()
+                    kept = self.filter_batch(batch)
+                    result.skipped += len(batch) - len(kept)
+                    batch = kept
+                    if not batch:
+                        continue
+                    try:
+                        with (
+                            transaction.atomic(using=queryset.db)
+                            if self.atomic
+                            else contextlib.nullcontext()
+                        ):
+                            # Apply the function to the records
+                            failures = self.handle_batch(batch) or []
+                    except Exception as e:
+                        if self.on_error == "raise":
+                            raise
+                        failures = [(item, e) for item in batch]
+
+                    if metrics is not None:
+                        metrics.batch_seconds.append(
+                            time.perf_counter() - batch_started
+                        )
+
+                    if failures and self.on_error == "raise":
+                        raise failures[0][1]
+
+                    result.processed += len(batch) - len(failures)
+                    result.failures.extend(failures)
+
+                    if progress is not None and store is not None:
+                        progress.processed += len(batch) - len(failures)
+                        progress.failed += len(failures)
+                        store.save(progress)
+        finally:
+            _current_run.reset(token)
+            if metrics is not None and sink is not None:
+                metrics.total_seconds = time.perf_counter() - started
+                metrics.processed = result.processed
+                metrics.skipped += result.skipped
+                metrics.failed = result.failed
+                sink.record(metrics)
+
+        return result
+
+    def failure_response(self, result: RunResult) -> HttpResponse:
+        """Returns a CSV download listing the primary key and error of each
+        failed item.
+
+        Args:
+            result: The outcome of the run.
+        """
+        filename = f"{self.name}-failures.csv"
+        response = HttpResponse(
+            content_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+        writer = csv.writer(response)
+        writer.writerow(["pk", "error"])
+        for item, error in result.failures:
+            writer.writerow([item_pk(item), f"{type(error).__name__}: {error}"])
+        return response
+
+    def start_deferred(
         self, modeladmin: ModelAdmin, request: HttpRequest, queryset: QuerySet[Model]
     ) -> None:
-        """Calls ``self.handle_item`` for each item in ``queryset`` that passes
-        ``self.condition``.
+        """Hands the selected primary keys to ``self.backend`` to run later.
+
+        Only the primary keys of rows matching the filter conditions are read
+        in the request; callable conditions are checked by the deferred run.
 
         Args:
             modeladmin: The admin instance for the model being processed.
             request: The current HTTP request object.
             queryset: The queryset of records to process.
+
+        Raises:
+            ValueError: If the action has no backend.
         """
-        _count: int = 0  # Number of records successfully processed
+        backend, store = self.backend, self.progress_store
+        if backend is None:
+            raise ValueError("Only actions with a backend can be deferred.")
 
-        for record in queryset:
-            if not self.condition(
-                record
-            ):  # Skip any records that don't meet the condition
-                continue
-            self.handle_item(record)  # Apply the function to the record
-            _count += 1  # Increment the counter, record was successfully processed
-
-        if _count:  # If any records were processed, notify the user
-            # Get the appropriate plural model name, or a reasonable fallback
-            model_name = (
-                queryset.model._meta.verbose_name_plural
-                or queryset.model.__name__ + "s"
+        pks = list(
+            self.get_queryset(queryset).values_list("pk", flat=True).order_by("pk")
+        )
+        if not pks:
+            return
+
+        run_id = uuid.uuid4().hex
+        model_label = queryset.model._meta.label
+        if store is not None:  # The page works before the job starts
+            store.save_pks(run_id, pks)
+            store.save(
+                Progress(run_id, self.name, model_label, len(pks), checkpointed=True)
             )
-            if _count == 1:
-                # Get the appropriate singular model name, or a reasonable fallback
-                model_name = (
-                    queryset.model._meta.verbose_name or queryset.model.__name__
-                )
 
-            model_name = model_name.title()
+        backend.submit(self.name, model_label, pks, run_id=run_id)
+
+        message = (
+            f"Started {self.__name__} for {len(pks)} "
+            f"{self.get_model_name(queryset.model, len(pks))} in the background."
+        )
+        if url := self.progress_url(modeladmin, run_id):
+            message = format_html(
+                '{} <a href="{}">Follow its progress</a>.', message, url
+            )
+        modeladmin.message_user(request, message, messages.INFO)
+
+    def resume(self, run_id: str, *, force: bool = False) -> Any:
+        """Hands the records a deferred run hadn't reached by its last
+        checkpoint to ``self.backend``.
+
+        Deferred runs save a checkpoint after each chunk of records, so a run
+        that failed can continue without handling finished chunks again.
+        Returns whatever ``self.backend.submit`` returns.
+
+        A worker that is killed or restarted can't mark its run as failed, so
+        the run stays ``"running"``. Pass ``force=True`` to resume it anyway,
+        once you know the worker is gone; a live run would handle the
+        remaining records twice.
+
+        Args:
+            run_id: Identifies the run.
+            force: Whether to resume the run even if it is still
+                ``"running"``.
+
+        Raises:
+            LookupError: If the run has no checkpoint.
+            ValueError: If the action isn't deferred, or the run is finished,
+                or still running and ``force`` isn't set.
+        """
+        backend, store = self.backend, self.progress_store
+        if backend is None or store is None:
+            raise ValueError(
+                "Only actions with a backend and a progress_store can be resumed."
+            )
+
+        progress = store.get(run_id)
+        pks = store.get_pks(run_id)
+        if progress is None or pks is None:
+            raise LookupError(f"No checkpoint for run {run_id!r}.")
+        if progress.status == "finished" or not (force or progress.resumable):
+            raise ValueError(f"Run {run_id!r} is {progress.status}, not resumable.")
+
+        progress.processed = progress.checkpoint_processed
+        progress.failed = progress.checkpoint_failed
+        progress.status = "running"
+        store.save(progress)
+
+        return backend.submit(
+            self.name, progress.model, progress.remaining_pks(pks), run_id=run_id
+        )
 
+    def __call__(
+        self, modeladmin: ModelAdmin, request: HttpRequest, queryset: QuerySet[Model]
+    ) -> HttpResponse | None:
+        """Runs the action for ``queryset`` and tells the user how it went.
+
+        If the action has a ``backend``, the run is deferred to it instead,
+        and only then is its progress tracked. With ``on_error="collect"``, a
+        CSV of failed primary keys is returned for download when any item
+        fails.
+
+        Args:
+            modeladmin: The admin instance for the model being processed.
+            request: The current HTTP request object.
+            queryset: The queryset of records to process.
+        """
+        if self.backend is not None:
+            self.start_deferred(modeladmin, request, queryset)
+            return None
+
+        result = self.run(queryset)
+        skipped = f"; {result.skipped} {self.skipped_label}" if result.skipped else ""
+
+        if result.failed:  # Report successes and failures together
+            modeladmin.message_user(
+                request,
+                f"Called {self.__name__} for {result.processed} "
+                f"{self.get_model_name(queryset.model, result.processed)}; "
+                f"{result.failed} failed{skipped}.",
+                messages.WARNING if result.processed else messages.ERROR,
+            )
+        elif result.processed:  # If any records were processed, notify the user
             modeladmin.message_user(  # Add a success message for the user
                 request,
-                f"Called {self.__name__} for {_count} {model_name}.",
+                f"Called {self.__name__} for {result.processed} "
+                f"{self.get_model_name(queryset.model, result.processed)}"
+                f"{skipped}.",
                 messages.SUCCESS,
             )
+        elif result.skipped:  # Tell the user nothing was left to do
+            modeladmin.message_user(
+                request,
+                f"Called {self.__name__} for no "
+                f"{self.get_model_name(queryset.model, 0)}{skipped}.",
+                messages.INFO,
+            )
+
+        if result.failed and self.on_error == "collect":
+            return self.failure_response(result)
+        return None
 
     def __init__(
         self,
         function: Function,
         *,
-        condition: Condition | None = None,
+        condition: Condition
+        | FilterCondition
+        | Sequence[Condition | FilterCondition]
+        | None = None,
         name: str | None = None,
         short_description: str | None = None,
+        chunk_size: int | None = None,
+        backend: DeferredBackend | None = None,
+        on_error: ErrorPolicy | None = None,
+        atomic: bool = False,
+        metrics: MetricsSink | None = None,
+        select_related: Sequence[str] = (),
+        prefetch_related: Sequence[str | Prefetch] = (),
+        query_budget: int | None = None,
+        on_query_budget: Literal["warn", "raise"] = "warn",
+        only: Sequence[str] = (),
+        defer: Sequence[str] = (),
+        clear_ordering: bool = False,
+        strip_annotations: bool = False,
+        progress_store: ProgressStore | None = None,
+        throttle: Throttle | None = None,
+        batch_condition: BatchCondition | None = None,
+        batch_fields: Sequence[str] = (),
+        batch_columns: Literal["list", "numpy"] = "list",
     ) -> None:
         """
         Initializes the action with a function and an optional condition.
 
         Args:
             function: Callable that takes a model instance.
-            condition: Callable for whether to process each record.
+            condition: Callable for whether to process each record, or a ``Q``
+                object or expression to filter the queryset with. A list or
+                tuple may mix both; filters are applied by the database and
+                callables are checked on each remaining record.
             name: Internal identifier used by Django admin if
                 ``short_description`` is not provided.
             short_description: User-facing label shown in the Django admin
                 dropdown.
+            chunk_size: Number of records to fetch from the database at a
+                time. If omitted, the whole queryset is loaded at once.
+            backend: Where to run the action instead of the admin request. The
+                action's ``name`` must be unique among deferred actions.
+            on_error: What to do when handling an item raises an exception.
+                ``"raise"`` stops the run, ``"skip"`` carries on and reports
+                how many items failed, and ``"collect"`` also offers a CSV of
+                the failed primary keys for download, so only those need to
+                be retried. Defaults to ``default_on_error``.
+            atomic: Whether to commit once per batch of ``chunk_size`` items,
+                instead of once per statement. Each batch runs in
+                ``transaction.atomic()``; a batch that raises is rolled back.
+                Requires ``chunk_size``.
+                Work done in other threads or processes isn't covered.
+            metrics: Where to send timings and counts of each run. Runs are
+                only timed when a sink is given.
+            select_related: Related fields to fetch with each record, so the
+                condition and ``handle_item`` can use them without a query.
+            prefetch_related: Related lookups to prefetch for each chunk of
+                records.
+            query_budget: How many queries the condition, and handling, may
+                each make for a single item. Going over usually means an N+1
+                query pattern. Queries aren't counted if this is omitted.
+            on_query_budget: Whether going over ``query_budget`` emits a
+                ``QueryBudgetWarning`` or raises ``QueryBudgetExceeded``.
+            only: The only fields to load for each record. Use this to fetch
+                just the columns the function and condition read.
+            defer: Fields not to load for each record, like large text or
+                JSON columns that the function and condition don't read.
+            clear_ordering: Whether to drop the admin's ordering, so the
+                database doesn't have to sort the selection.
+            strip_annotations: Whether to drop annotations added by the
+                admin's changelist, so they aren't computed for every row.
+            progress_store: Where each deferred run saves how far along it is,
+                after every batch. Inline runs finish within the request, so
+                they aren't tracked. See ``action_hero.progress``.
+            throttle: Limits the rate and concurrency of calls, and pauses them
+                while downstream queues are too deep. See
+                :py:class:`~action_hero.throttle.Throttle`.
+            batch_condition: A callable that takes a chunk of rows as a
+                dictionary of columns and returns one Boolean per row, like a
+                NumPy mask. It replaces a per-record callable for the parts of
+                a check that can be vectorized. See ``iter_masked_records``.
+            batch_fields: The fields read for ``batch_condition``, besides
+                ``"pk"``.
+            batch_columns: ``"list"`` to pass columns as lists, or ``"numpy"``
+                to pass them as NumPy arrays. NumPy must be installed.
         """
 
-        if condition is not None:
-            if isinstance(condition, Callable):
-                self.condition = condition
+        if condition is None:
+            conditions = []
+        elif isinstance(condition, (list, tuple)):
+            conditions = list(condition)
+        else:
+            conditions = [condition]
+
+        checks: list[Condition] = []
+        self.condition_filters: list[FilterCondition] = []
+        for _condition in conditions:
+            if isinstance(_condition, (Q, BaseExpression)):
+                self.condition_filters.append(_condition)
+            elif isinstance(_condition, Callable):
+                checks.append(_condition)
             else:
-                raise TypeError("The condition must be a callable.")
+                raise TypeError(
+                    "The condition must be a callable, a Q object, or an expression."
+                )
+
+        if not checks:
+            self.condition = _no_condition
+        elif len(checks) == 1:
+            self.condition = checks[0]
         else:
-            self.condition = lambda _: True
+            self.condition = lambda item: all(check(item) for check in checks)
 
         if not callable(function):
             raise TypeError("The function must be a callable.")
@@ -153,3 +1078,83 @@ class AdminActionBaseClass(abc.ABC):
         self.__name__ = self.name
 
         self.short_description = short_description
+
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("The chunk_size must be a positive integer.")
+
+        self.chunk_size = chunk_size
+
+        if backend is not None and not isinstance(backend, DeferredBackend):
+            raise TypeError("The backend must be a DeferredBackend.")
+
+        on_error = on_error or self.default_on_error
+        if on_error not in ("raise", "skip", "collect"):
+            raise ValueError(f"Unknown failure policy: {on_error!r}")
+
+        self.on_error = on_error
+
+        if atomic and chunk_size is None:
+            raise ValueError(
+                "An atomic action needs a chunk_size, so a single transaction "
+                "doesn't hold locks on the whole selection."
+            )
+
+        self.atomic = atomic
+
+        if metrics is not None and not isinstance(metrics, MetricsSink):
+            raise TypeError("The metrics must be a MetricsSink.")
+
+        self.metrics = metrics
+
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+
+        if query_budget is not None and query_budget < 0:
+            raise ValueError("The query_budget can't be negative.")
+        if on_query_budget not in ("warn", "raise"):
+            raise ValueError(f"Unknown query budget policy: {on_query_budget!r}")
+
+        self.query_budget = query_budget
+        self.on_query_budget = on_query_budget
+
+        self.only = tuple(only)
+        self.defer = tuple(defer)
+        self.clear_ordering = clear_ordering
+        self.strip_annotations = strip_annotations
+
+        if progress_store is not None and not isinstance(progress_store, ProgressStore):
+            raise TypeError("The progress_store must be a ProgressStore.")
+
+        self.progress_store = progress_store
+
+        if throttle is not None and not isinstance(throttle, Throttle):
+            raise TypeError("The throttle must be a Throttle.")
+
+        self.throttle = throttle
+
+        if batch_condition is not None and not callable(batch_condition):
+            raise TypeError("The batch_condition must be callable.")
+        if batch_columns not in ("list", "numpy"):
+            raise ValueError(f"Unknown batch columns: {batch_columns!r}")
+        if batch_columns == "numpy":
+            try:
+                import numpy  # noqa: F401
+            except ImportError as e:
+                raise ImportError(
+                    "NumPy columns require numpy to be installed. You can "
+                    "install it with: pip install django-admin-action-hero[numpy]"
+                ) from e
+
+        self.batch_condition = batch_condition
+        self.batch_fields = tuple(batch_fields)
+        self.batch_columns = batch_columns
+
+        self.backend = backend
+        if backend is not None:
+            registered = _deferred_actions.get(self.name)
+            if registered is not None and registered is not self:
+                raise ValueError(
+                    f"A deferred action named {self.name!r} already exists; give "
+                    "each deferred action a unique name."
+                )
+            _deferred_actions[self.name] = self
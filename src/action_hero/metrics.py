@@ -0,0 +1,241 @@
+"""Provides timing metrics for action runs and sinks to send them to."""
+
+from __future__ import annotations
+
+import abc
+import dataclasses
+import logging
+import math
+import time
+from array import array
+from collections.abc import Callable, Iterator
+from typing import Any
+
+__all__ = [
+    "InMemorySink",
+    "LoggingSink",
+    "MetricsSink",
+    "RunMetrics",
+    "StatsdSink",
+]
+
+
+@dataclasses.dataclass
+class RunMetrics:
+    """Timings and counts collected while an action runs.
+
+    Durations are in seconds. ``handle_seconds`` holds one duration per item
+    when items are handled one at a time, and ``batch_seconds`` one per call
+    to ``handle_batch``.
+    """
+
+    #: Name of the action.
+    action: str
+    #: ``app_label.ModelName`` of the processed records.
+    model: str
+    #: Time spent fetching records from the database.
+    fetch_seconds: float = 0.0
+    #: Time spent evaluating the callable condition.
+    condition_seconds: float = 0.0
+    #: Duration of each ``handle_item`` call.
+    handle_seconds: array = dataclasses.field(default_factory=lambda: array("d"))
+    #: Duration of each ``handle_batch`` call.
+    batch_seconds: array = dataclasses.field(default_factory=lambda: array("d"))
+    #: Wall-clock duration of the whole run.
+    total_seconds: float = 0.0
+    #: Number of items handled successfully.
+    processed: int = 0
+    #: Number of items rejected by the callable condition.
+    skipped: int = 0
+    #: Number of items whose handling failed.
+    failed: int = 0
+
+    def percentile(self, percent: float) -> float:
+        """Returns a percentile of the per-item handling time.
+
+        Falls back to per-batch durations if no item was timed on its own.
+
+        Args:
+            percent: The percentile to compute, from 0 to 100.
+        """
+        durations = sorted(self.handle_seconds or self.batch_seconds)
+        if not durations:
+            return 0.0
+        index = max(math.ceil(percent / 100 * len(durations)) - 1, 0)
+        return durations[index]
+
+    @property
+    def handle_p50(self) -> float:
+        """Median handling time."""
+        return self.percentile(50)
+
+    @property
+    def handle_p95(self) -> float:
+        """95th percentile handling time."""
+        return self.percentile(95)
+
+    @property
+    def handle_max(self) -> float:
+        """Slowest handling time."""
+        return self.percentile(100)
+
+    def summary(self) -> dict[str, Any]:
+        """Returns the headline numbers as a flat dictionary."""
+        return {
+            "action": self.action,
+            "model": self.model,
+            "total_seconds": self.total_seconds,
+            "fetch_seconds": self.fetch_seconds,
+            "condition_seconds": self.condition_seconds,
+            "handle_p50": self.handle_p50,
+            "handle_p95": self.handle_p95,
+            "handle_max": self.handle_max,
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+        }
+
+    def timed_records(self, records: Iterator[Any]) -> Iterator[Any]:
+        """Yields from ``records``, adding the time spent waiting for each
+        record to ``fetch_seconds``."""
+        while True:
+            start = time.perf_counter()
+            try:
+                record = next(records)
+            except StopIteration:
+                return
+            finally:
+                self.fetch_seconds += time.perf_counter() - start
+            yield record
+
+    def timed_condition(
+        self, condition: Callable[[Any], bool]
+    ) -> Callable[[Any], bool]:
+        """Wraps ``condition`` to add its run time to ``condition_seconds`` and
+        count rejected items in ``skipped``."""
+
+        def _condition(item: Any) -> bool:
+            start = time.perf_counter()
+            passed = condition(item)
+            self.condition_seconds += time.perf_counter() - start
+            if not passed:
+                self.skipped += 1
+            return passed
+
+        return _condition
+
+
+class MetricsSink(abc.ABC):
+    """Receives the metrics of every finished run of an action.
+
+    Give an action a ``metrics`` sink to turn on instrumentation. Without one,
+    nothing is timed.
+    """
+
+    @abc.abstractmethod
+    def record(self, metrics: RunMetrics) -> None:
+        """Handles the metrics of a finished run.
+
+        Args:
+            metrics: The collected timings and counts.
+        """
+
+
+class InMemorySink(MetricsSink):
+    """Keeps every run's metrics in a list, e.g. to make assertions in tests.
+
+    Example usage::
+
+        sink = InMemorySink()
+        action = SimpleAction(my_function, metrics=sink)
+        ...
+        assert sink.runs[-1].handle_p95 < 0.05
+    """
+
+    def __init__(self) -> None:
+        self.runs: list[RunMetrics] = []
+
+    def record(self, metrics: RunMetrics) -> None:
+        """Stores the metrics.
+
+        Args:
+            metrics: The collected timings and counts.
+        """
+        self.runs.append(metrics)
+
+    def clear(self) -> None:
+        """Forgets every stored run."""
+        self.runs.clear()
+
+
+class LoggingSink(MetricsSink):
+    """Logs a summary of each run.
+
+    The summary is also attached to the log record as ``action_hero_metrics``
+    for structured log handlers.
+    """
+
+    def __init__(
+        self, logger: logging.Logger | None = None, level: int = logging.INFO
+    ) -> None:
+        """Initializes the sink.
+
+        Args:
+            logger: Where to log. Defaults to this module's logger.
+            level: The level to log at.
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def record(self, metrics: RunMetrics) -> None:
+        """Logs the metrics.
+
+        Args:
+            metrics: The collected timings and counts.
+        """
+        summary = metrics.summary()
+        self.logger.log(
+            self.level,
+            "%(action)s on %(model)s: %(processed)d processed, %(skipped)d "
+            "skipped, %(failed)d failed in %(total_seconds).3fs (fetch "
+            "%(fetch_seconds).3fs, condition %(condition_seconds).3fs, handle "
+            "p50 %(handle_p50).4fs, p95 %(handle_p95).4fs, max %(handle_max).4fs)",
+            summary,
+            extra={"action_hero_metrics": summary},
+        )
+
+
+class StatsdSink(MetricsSink):
+    """Sends each run's metrics to a statsd-style client.
+
+    Any client with ``timing(name, milliseconds)`` and ``incr(name, count)``
+    methods works, like the client of the ``statsd`` package.
+    Metric names are ``<prefix>.<action>.<metric>``.
+    """
+
+    def __init__(self, client: Any, prefix: str = "action_hero") -> None:
+        """Initializes the sink.
+
+        Args:
+            client: The statsd-style client.
+            prefix: Prepended to every metric name.
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def record(self, metrics: RunMetrics) -> None:
+        """Sends the metrics.
+
+        Args:
+            metrics: The collected timings and counts.
+        """
+        name = f"{self.prefix}.{metrics.action}"
+        for metric in ("total_seconds", "fetch_seconds", "condition_seconds"):
+            seconds = getattr(metrics, metric)
+            self.client.timing(
+                f"{name}.{metric.removesuffix('_seconds')}", seconds * 1000
+            )
+        for metric in ("handle_p50", "handle_p95", "handle_max"):
+            self.client.timing(f"{name}.{metric}", getattr(metrics, metric) * 1000)
+        for metric in ("processed", "skipped", "failed"):
+            self.client.incr(f"{name}.{metric}", getattr(metrics, metric))
@@ -0,0 +1,448 @@
+"""Provides progress tracking for long action runs and views to poll it."""
+
+from __future__ import annotations
+
+import abc
+import bisect
+import dataclasses
+import threading
+import time
+from typing import Any, Literal
+
+from django.contrib import messages
+from django.core.cache import caches
+from django.core.exceptions import PermissionDenied
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    HttpResponseRedirect,
+    JsonResponse,
+)
+from django.middleware.csrf import get_token
+from django.urls import URLPattern, path
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+__all__ = [
+    "CacheProgressStore",
+    "InMemoryProgressStore",
+    "Progress",
+    "ProgressAdminMixin",
+    "ProgressStore",
+    "progress_response",
+]
+
+
+@dataclasses.dataclass
+class Progress:
+    """How far along a single run of an action is."""
+
+    #: Identifies the run.
+    run_id: str
+    #: Name of the action.
+    action: str
+    #: ``app_label.ModelName`` of the processed records.
+    model: str
+    #: Number of records selected for the run.
+    total: int
+    #: Number of items handled successfully so far.
+    processed: int = 0
+    #: Number of items whose handling failed so far.
+    failed: int = 0
+    #: ``"running"`` until the run ends, then ``"finished"`` or ``"failed"``.
+    status: Literal["running", "finished", "failed"] = "running"
+    #: When the run started, as a Unix timestamp.
+    started_at: float = dataclasses.field(default_factory=time.time)
+    #: When the progress was last saved, as a Unix timestamp.
+    updated_at: float = dataclasses.field(default_factory=time.time)
+    #: Whether the selected primary keys were saved with the progress, so
+    #: the run can be resumed. See ``ProgressStore.save_pks``.
+    checkpointed: bool = False
+    #: The highest primary key of the last finished chunk.
+    last_pk: Any = None
+    #: ``processed`` as of the last checkpoint.
+    checkpoint_processed: int = 0
+    #: ``failed`` as of the last checkpoint.
+    checkpoint_failed: int = 0
+
+    @property
+    def percent(self) -> float:
+        """Share of the selected records dealt with so far, from 0 to 100."""
+        if self.status == "finished" or not self.total:
+            return 100.0
+        return min(100.0, 100 * (self.processed + self.failed) / self.total)
+
+    @property
+    def resumable(self) -> bool:
+        """Whether the run has a checkpoint and has failed.
+
+        A run that is still ``"running"`` isn't resumable, even if it hasn't
+        saved in a while: a long batch can't be told apart from a dead worker,
+        and resuming a live run would handle its records twice. Resume a run
+        whose worker was killed with ``force=True`` instead.
+        """
+        return self.checkpointed and self.status == "failed"
+
+    def checkpoint(self, last_pk: Any) -> None:
+        """Records that every selected record up to ``last_pk`` was handled.
+
+        Args:
+            last_pk: The highest primary key of the chunk that just finished.
+        """
+        self.last_pk = last_pk
+        self.checkpoint_processed = self.processed
+        self.checkpoint_failed = self.failed
+
+    def remaining_pks(self, pks: list[Any]) -> list[Any]:
+        """Returns the primary keys in ``pks`` after the last checkpoint.
+
+        Args:
+            pks: The selected primary keys, sorted.
+        """
+        if self.last_pk is None:
+            return list(pks)
+        return pks[bisect.bisect_right(pks, self.last_pk) :]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the progress as a JSON-serializable dictionary."""
+        data = dataclasses.asdict(self)
+        return {**data, "percent": self.percent, "resumable": self.resumable}
+
+
+class ProgressStore(abc.ABC):
+    """Keeps the latest progress of action runs.
+
+    Give a deferred action a ``progress_store`` to have each run save its
+    progress after every batch. The store must be shared by every process that runs
+    the action or serves the progress view.
+
+    A deferred run's selected primary keys are saved once, apart from the
+    progress, so saving the counters after each batch stays cheap however
+    many records were selected.
+    """
+
+    @abc.abstractmethod
+    def save(self, progress: Progress) -> None:
+        """Stores the latest progress of a run.
+
+        Args:
+            progress: The progress to store.
+        """
+
+    @abc.abstractmethod
+    def get(self, run_id: str) -> Progress | None:
+        """Returns the latest progress of a run, if there is any.
+
+        Args:
+            run_id: Identifies the run.
+        """
+
+    @abc.abstractmethod
+    def save_pks(self, run_id: str, pks: list[Any]) -> None:
+        """Stores the selected primary keys of a run, to resume it from.
+
+        Args:
+            run_id: Identifies the run.
+            pks: The selected primary keys, sorted.
+        """
+
+    @abc.abstractmethod
+    def get_pks(self, run_id: str) -> list[Any] | None:
+        """Returns the selected primary keys of a run, if they were saved.
+
+        Args:
+            run_id: Identifies the run.
+        """
+
+
+class InMemoryProgressStore(ProgressStore):
+    """Keeps progress in a dictionary in the current process.
+
+    Only useful for inline runs, runs in threads, and tests; runs in other
+    processes can't see it.
+    """
+
+    def __init__(self) -> None:
+        self._progress: dict[str, Progress] = {}
+        self._pks: dict[str, list[Any]] = {}
+        self._lock = threading.Lock()
+
+    def save(self, progress: Progress) -> None:
+        """Stores a copy of the latest progress of a run.
+
+        Args:
+            progress: The progress to store.
+        """
+        progress.updated_at = time.time()
+        with self._lock:
+            self._progress[progress.run_id] = dataclasses.replace(progress)
+
+    def get(self, run_id: str) -> Progress | None:
+        """Returns the latest progress of a run, if there is any.
+
+        Args:
+            run_id: Identifies the run.
+        """
+        with self._lock:
+            progress = self._progress.get(run_id)
+        return dataclasses.replace(progress) if progress else None
+
+    def save_pks(self, run_id: str, pks: list[Any]) -> None:
+        """Stores the selected primary keys of a run.
+
+        Args:
+            run_id: Identifies the run.
+            pks: The selected primary keys, sorted.
+        """
+        with self._lock:
+            self._pks[run_id] = list(pks)
+
+    def get_pks(self, run_id: str) -> list[Any] | None:
+        """Returns the selected primary keys of a run, if they were saved.
+
+        Args:
+            run_id: Identifies the run.
+        """
+        with self._lock:
+            return self._pks.get(run_id)
+
+
+class CacheProgressStore(ProgressStore):
+    """Keeps progress in one of Django's caches.
+
+    Use a cache shared between processes, like Redis or Memcached, so the web
+    process can see the progress of runs in workers.
+    """
+
+    def __init__(
+        self,
+        alias: str = "default",
+        *,
+        timeout: int = 60 * 60 * 24,
+        key_prefix: str = "action_hero:progress:",
+    ) -> None:
+        """Initializes the store.
+
+        Args:
+            alias: Which cache in ``settings.CACHES`` to use.
+            timeout: How long, in seconds, to keep a run's progress after its
+                last update, and its primary keys after they are saved.
+            key_prefix: Prepended to each run id to make the cache key.
+        """
+        self.alias = alias
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+
+    def save(self, progress: Progress) -> None:
+        """Stores the latest progress of a run.
+
+        Args:
+            progress: The progress to store.
+        """
+        progress.updated_at = time.time()
+        caches[self.alias].set(
+            self.key_prefix + progress.run_id,
+            dataclasses.asdict(progress),
+            self.timeout,
+        )
+
+    def get(self, run_id: str) -> Progress | None:
+        """Returns the latest progress of a run, if there is any.
+
+        Args:
+            run_id: Identifies the run.
+        """
+        data = caches[self.alias].get(self.key_prefix + run_id)
+        return Progress(**data) if data else None
+
+    def save_pks(self, run_id: str, pks: list[Any]) -> None:
+        """Stores the selected primary keys of a run, under a key of their own.
+
+        Args:
+            run_id: Identifies the run.
+            pks: The selected primary keys, sorted.
+        """
+        caches[self.alias].set(
+            f"{self.key_prefix}{run_id}:pks", list(pks), self.timeout
+        )
+
+    def get_pks(self, run_id: str) -> list[Any] | None:
+        """Returns the selected primary keys of a run, if they were saved.
+
+        Args:
+            run_id: Identifies the run.
+        """
+        return caches[self.alias].get(f"{self.key_prefix}{run_id}:pks")
+
+
+def progress_response(
+    request: HttpRequest,
+    store: ProgressStore,
+    run_id: str,
+    resume_url: str | None = None,
+) -> HttpResponse:
+    """Returns the progress of a run as JSON, or with ``?format=html``, as a
+    small page that refreshes itself until the run ends.
+
+    Args:
+        request: The current HTTP request object.
+        store: Where the run's progress is kept.
+        run_id: Identifies the run.
+        resume_url: Where to post to resume the run. If given, the page shows
+            a resume button once the run is resumable, and a force resume
+            button while a run with a checkpoint is still running, for when
+            its worker was killed.
+
+    Raises:
+        Http404: If the store has no progress for the run.
+    """
+    progress = store.get(run_id)
+    if progress is None:
+        raise Http404("No progress found for this run.")
+
+    if request.GET.get("format") != "html":
+        return JsonResponse(progress.to_dict())
+
+    refresh = (
+        mark_safe('<meta http-equiv="refresh" content="2">')
+        if progress.status == "running"
+        else ""
+    )
+    resume = ""
+    if resume_url and progress.resumable:
+        resume = format_html(
+            '<form method="post" action="{}">'
+            '<input type="hidden" name="csrfmiddlewaretoken" value="{}">'
+            '<button type="submit">Resume</button></form>',
+            resume_url,
+            get_token(request),
+        )
+    elif resume_url and progress.checkpointed and progress.status == "running":
+        resume = format_html(
+            '<form method="post" action="{}">'
+            '<input type="hidden" name="csrfmiddlewaretoken" value="{}">'
+            '<input type="hidden" name="force" value="1">'
+            "<p>If the run's worker was killed or restarted, resume it from "
+            "its last checkpoint. A run that is still alive would handle its "
+            "records twice.</p>"
+            '<button type="submit">Force resume</button></form>',
+            resume_url,
+            get_token(request),
+        )
+    return HttpResponse(
+        format_html(
+            "<!DOCTYPE html><html><head><title>{action}</title>{refresh}</head>"
+            "<body><h1>{action}</h1>"
+            '<progress max="100" value="{percent}">{percent}%</progress>'
+            "<p>{processed} processed, {failed} failed, {total} selected. "
+            "Status: {status}.</p>{resume}</body></html>",
+            refresh=refresh,
+            resume=resume,
+            percent=round(progress.percent),
+            **{
+                key: getattr(progress, key)
+                for key in ("action", "processed", "failed", "total", "status")
+            },
+        )
+    )
+
+
+class ProgressAdminMixin:
+    """Adds progress and resume endpoints for action runs to a ``ModelAdmin``.
+
+    The endpoints answer for any action in the admin's ``actions`` that has a
+    ``progress_store``. Deferred actions link to the progress page from the
+    message they show when a run starts. Runs that failed can be resumed from
+    their last checkpoint with the page's resume button, and runs stuck in
+    ``"running"`` because their worker was killed with its force resume
+    button.
+
+    Example usage::
+
+        progress = CacheProgressStore()
+
+        class MyModelAdmin(ProgressAdminMixin, admin.ModelAdmin):
+            actions = [
+                SimpleAction(
+                    process, backend=ThreadBackend(), progress_store=progress
+                )
+            ]
+    """
+
+    def get_urls(self) -> list[URLPattern]:
+        """Adds the ``<app>_<model>_action_progress`` and
+        ``<app>_<model>_action_resume`` URLs to the admin."""
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path(
+                "action-progress/<str:run_id>/",
+                self.admin_site.admin_view(self.action_progress_view),
+                name="{}_{}_action_progress".format(*info),
+            ),
+            path(
+                "action-progress/<str:run_id>/resume/",
+                self.admin_site.admin_view(self.action_resume_view),
+                name="{}_{}_action_resume".format(*info),
+            ),
+            *super().get_urls(),
+        ]
+
+    def get_progress_action(self, run_id: str) -> Any:
+        """Returns the action in ``self.actions`` whose store holds the run.
+
+        Args:
+            run_id: Identifies the run.
+
+        Raises:
+            Http404: If no action has progress for the run.
+        """
+        for action in self.actions or ():
+            store = getattr(action, "progress_store", None)
+            if store is not None and store.get(run_id) is not None:
+                return action
+        raise Http404("No progress found for this run.")
+
+    def action_progress_view(self, request: HttpRequest, run_id: str) -> HttpResponse:
+        """Returns the progress of a run of one of this admin's actions.
+
+        Args:
+            request: The current HTTP request object.
+            run_id: Identifies the run.
+        """
+        if not self.has_view_or_change_permission(request):
+            raise Http404("No progress found for this run.")
+
+        action = self.get_progress_action(run_id)
+        resume_url = (
+            "resume/"
+            if action.backend is not None and self.has_change_permission(request)
+            else None
+        )
+        return progress_response(request, action.progress_store, run_id, resume_url)
+
+    def action_resume_view(self, request: HttpRequest, run_id: str) -> HttpResponse:
+        """Resumes a deferred run from its last checkpoint, then redirects to
+        its progress page.
+
+        Posting ``force=1`` resumes a run that is still ``"running"``, for
+        when its worker was killed.
+
+        Args:
+            request: The current HTTP request object.
+            run_id: Identifies the run.
+        """
+        if request.method != "POST":
+            return HttpResponseNotAllowed(["POST"])
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+
+        action = self.get_progress_action(run_id)
+        try:
+            action.resume(run_id, force=request.POST.get("force") == "1")
+        except (LookupError, ValueError) as e:
+            self.message_user(request, str(e), messages.ERROR)
+        else:
+            self.message_user(request, f"Resumed {action.__name__}.", messages.INFO)
+        return HttpResponseRedirect("../?format=html")
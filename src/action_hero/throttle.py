@@ -0,0 +1,182 @@
+"""Provides rate limiting and backpressure for the work actions dispatch."""
+
+from __future__ import annotations
+
+import contextlib
+import math
+import threading
+import time
+from collections.abc import Callable, Iterator
+
+__all__ = ["Throttle"]
+
+
+class Throttle:
+    """Limits how fast and how much work an action dispatches.
+
+    Every call an action makes, like calling its function for a record or
+    queuing a Celery task, first takes a slot from the throttle. Three limits
+    can be combined:
+
+    * ``rate`` and ``burst`` form a token bucket: on average at most ``rate``
+      calls start per second, with up to ``burst`` at once after a pause.
+    * ``max_in_flight`` caps how many calls run at the same time, e.g. across
+      the threads of a ``ThreadPoolAction``.
+    * ``queue_depth`` is a hook returning how much work is waiting downstream,
+      like the length of a broker queue. While it is above ``max_queue_depth``
+      dispatch pauses, for ``backoff`` seconds at first and twice as long on
+      each check that is still too deep, up to ``max_backoff``.
+
+    A throttle may be shared by several actions to give them a common budget.
+
+    Example usage::
+
+        def celery_queue_depth():
+            with app.connection_for_write() as conn:
+                return conn.default_channel.queue_declare(
+                    "celery", passive=True
+                ).message_count
+
+        throttle = Throttle(
+            rate=50, queue_depth=celery_queue_depth, max_queue_depth=10_000
+        )
+        queue_action = QueueCeleryAction(my_celery_task, throttle=throttle)
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float | None = None,
+        burst: int | None = None,
+        max_in_flight: int | None = None,
+        queue_depth: Callable[[], int] | None = None,
+        max_queue_depth: int | None = None,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        check_interval: float = 1.0,
+    ) -> None:
+        """Initializes the throttle. Every limit is optional.
+
+        Args:
+            rate: Average number of calls allowed to start per second.
+            burst: Number of calls allowed to start at once after a pause.
+                Defaults to one second's worth of ``rate``.
+            max_in_flight: Maximum number of calls running at the same time.
+            queue_depth: Returns how much work is waiting downstream.
+            max_queue_depth: The ``queue_depth`` above which dispatch pauses.
+            backoff: Seconds of the first pause while the queue is too deep.
+            max_backoff: Longest pause while the queue is too deep.
+            check_interval: Minimum seconds between calls of ``queue_depth``
+                while the queue is short enough.
+
+        Raises:
+            ValueError: If a limit isn't positive, or only one of
+                ``queue_depth`` and ``max_queue_depth`` is given.
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError("The rate must be positive.")
+        if burst is not None and (rate is None or burst < 1):
+            raise ValueError("The burst must be a positive integer with a rate.")
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("The max_in_flight must be a positive integer.")
+        if (queue_depth is None) != (max_queue_depth is None):
+            raise ValueError("Give both queue_depth and max_queue_depth, or neither.")
+        if backoff <= 0 or max_backoff < backoff:
+            raise ValueError("The backoff must be positive and at most max_backoff.")
+
+        self.rate = rate
+        self.burst = burst or (max(1, math.ceil(rate)) if rate else None)
+        self.max_in_flight = max_in_flight
+        self.queue_depth = queue_depth
+        self.max_queue_depth = max_queue_depth
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._slots = threading.Condition()
+        self._tokens = float(self.burst or 0)
+        self._refilled_at = time.monotonic()
+        self._in_flight = 0
+        self._checked_at = -math.inf
+
+    def wait_for_queue(self) -> None:
+        """Pauses, backing off, while ``queue_depth`` is above
+        ``max_queue_depth``."""
+        if self.queue_depth is None:
+            return
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return
+
+        delay = self.backoff
+        while self.queue_depth() > self.max_queue_depth:
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_backoff)
+        self._checked_at = time.monotonic()
+
+    def take_tokens(self, n: int = 1) -> None:
+        """Waits until the token bucket allows ``n`` calls to start.
+
+        Calls beyond ``burst`` are let through as soon as the bucket is full,
+        leaving it in debt, so a large group never waits forever.
+
+        Args:
+            n: Number of calls about to start.
+        """
+        if self.rate is None:
+            return
+        needed = min(n, self.burst)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._refilled_at
+                self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+                self._refilled_at = now
+                if self._tokens >= needed:
+                    self._tokens -= n
+                    return
+                wait = (needed - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def acquire(self, n: int = 1) -> None:
+        """Waits until ``n`` calls may start, then counts them as in flight.
+
+        Args:
+            n: Number of calls about to start.
+        """
+        self.wait_for_queue()
+        self.take_tokens(n)
+        if self.max_in_flight is not None:
+            with self._slots:
+                # A group larger than the cap runs alone rather than never
+                self._slots.wait_for(
+                    lambda: (
+                        self._in_flight == 0
+                        or self._in_flight + n <= self.max_in_flight
+                    )
+                )
+                self._in_flight += n
+
+    def release(self, n: int = 1) -> None:
+        """Counts ``n`` calls as finished.
+
+        Args:
+            n: Number of calls that finished.
+        """
+        if self.max_in_flight is not None:
+            with self._slots:
+                self._in_flight -= n
+                self._slots.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self, n: int = 1) -> Iterator[None]:
+        """Holds a slot for ``n`` calls while the block runs.
+
+        Args:
+            n: Number of calls made in the block.
+        """
+        self.acquire(n)
+        try:
+            yield
+        finally:
+            self.release(n)
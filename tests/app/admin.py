@@ -1,5 +1,24 @@
 from django.contrib import admin
 
+from action_hero.actions import SimpleAction
+from action_hero.backends import InlineBackend
+from action_hero.progress import InMemoryProgressStore, ProgressAdminMixin
+
 
 class AdminActionsTestModelAdmin(admin.ModelAdmin):
     list_display = ("name",)
+
+
+progress_store = InMemoryProgressStore()
+
+
+class ProgressTestModelAdmin(ProgressAdminMixin, admin.ModelAdmin):
+    list_display = ("name",)
+    actions = (
+        SimpleAction(
+            lambda pk: None,
+            name="tracked",
+            backend=InlineBackend(),
+            progress_store=progress_store,
+        ),
+    )
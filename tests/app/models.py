@@ -3,6 +3,9 @@ from django.db import models
 
 class AdminActionsTestModel(models.Model):
     name = models.CharField(max_length=100)
+    parent = models.ForeignKey(
+        "self", null=True, blank=True, on_delete=models.CASCADE, related_name="children"
+    )
 
     class Meta:
         verbose_name = "Admin Actions Test"
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from django.urls import path
+
+from .admin import ProgressTestModelAdmin
+from .models import AdminActionsTestModel
+
+site = admin.AdminSite()
+site.register(AdminActionsTestModel, ProgressTestModelAdmin)
+
+urlpatterns = [path("admin/", site.urls)]
@@ -8,10 +8,21 @@ from django.contrib.admin import AdminSite
 from django.contrib.sessions.backends.cache import SessionStore
 from django.http import HttpRequest
 
+from action_hero import lib
+
 from .app.admin import AdminActionsTestModelAdmin
 from .app.models import AdminActionsTestModel
 
 
+@pytest.fixture(autouse=True)
+def deferred_actions() -> Generator[dict, Any, None]:
+    """Forget the deferred actions registered by a test after it runs."""
+    registered = dict(lib._deferred_actions)
+    yield lib._deferred_actions
+    lib._deferred_actions.clear()
+    lib._deferred_actions.update(registered)
+
+
 @pytest.fixture
 def mock_function() -> mock.MagicMock:
     """Create a mock function."""
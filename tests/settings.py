@@ -14,5 +14,7 @@ INSTALLED_APPS = [
     "tests.app.apps._AppConfig",
 ]
 
+ROOT_URLCONF = "tests.app.urls"
+
 SECRET_KEY = "RnJvbSB0aGUgcml2ZXIgdG8gdGhlIHNlYSwgUGFsZXN0aW5lIHdpbGwgYmUgZnJlZSE="
 USE_TZ = False
@@ -2,7 +2,8 @@ from unittest import mock
 
 import pytest
 from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
-from django.db.models import Model
+from django.db import transaction
+from django.db.models import Count, Model, Q
 
 from action_hero.lib import AdminActionBaseClass
 from tests.app.models import AdminActionsTestModel
@@ -133,3 +134,323 @@ def test_noncallable_function_raises():
     with pytest.raises(TypeError):
         # noinspection PyTypeChecker
         _AdminAction("not_a_function")  # pyright: ignore[reportArgumentType]
+
+
+@pytest.mark.django_db
+def test_chunk_size_streams_queryset(
+    admin,
+    model_instance,
+    mock_function,
+    mock_messages,
+    _request,
+):
+    """A chunk_size should stream records instead of caching the queryset."""
+    instances = [model_instance() for _ in range(3)]
+    r = _request("post", data={ACTION_CHECKBOX_NAME: [i.pk for i in instances]})
+    queryset = AdminActionsTestModel.objects.order_by("pk")
+
+    queue_action = _AdminAction(mock_function, chunk_size=2)
+    queue_action(admin, r, queryset)
+
+    mock_function.assert_has_calls([mock.call(i.pk) for i in instances])
+    assert queryset._result_cache is None  # The queryset was never cached
+    mock_messages.assert_called_once()
+
+
+def test_nonpositive_chunk_size_raises():
+    """A chunk_size below one should raise an error."""
+    with pytest.raises(ValueError):
+        _AdminAction(lambda _: ..., chunk_size=0)
+
+
+@pytest.mark.django_db
+def test_q_condition_filters_queryset(
+    admin,
+    model_instance,
+    mock_function,
+    mock_messages,
+    _request,
+    django_assert_num_queries,
+):
+    """A Q condition should be applied by the database before iterating."""
+    instance = model_instance()
+    model_instance()  # A second instance that should be excluded
+    r = _request("post", data={ACTION_CHECKBOX_NAME: [instance.pk]})
+
+    queue_action = _AdminAction(mock_function, condition=Q(pk=instance.pk))
+    with django_assert_num_queries(1):
+        queue_action(admin, r, AdminActionsTestModel.objects.all())
+
+    mock_function.assert_called_once_with(instance.pk)
+
+
+@pytest.mark.django_db
+def test_mixed_conditions_apply_filter_then_callable(
+    admin,
+    model_instance,
+    mock_function,
+    mock_messages,
+    _request,
+):
+    """Callables in a condition list should only see rows the filters kept."""
+    instance = model_instance()
+    rejected = model_instance()
+    filtered = model_instance()
+    r = _request("post", data={ACTION_CHECKBOX_NAME: [instance.pk]})
+    seen = []
+
+    def condition(record):
+        seen.append(record.pk)
+        return record.pk != rejected.pk
+
+    queue_action = _AdminAction(
+        mock_function, condition=[~Q(pk=filtered.pk), condition]
+    )
+    queue_action(admin, r, AdminActionsTestModel.objects.order_by("pk"))
+
+    assert seen == [instance.pk, rejected.pk]
+    mock_function.assert_called_once_with(instance.pk)
+
+
+@pytest.mark.django_db
+def test_failing_item_raises_by_default(admin, model_instance, _request):
+    """Without a failure policy, an exception should abort the run."""
+    instance = model_instance()
+    r = _request("post", data={ACTION_CHECKBOX_NAME: [instance.pk]})
+
+    def _function(pk):
+        raise RuntimeError("boom")
+
+    queue_action = _AdminAction(_function)
+    with pytest.raises(RuntimeError):
+        queue_action(admin, r, AdminActionsTestModel.objects.all())
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("on_error", ["skip", "collect"])
+def test_failing_item_is_isolated(
+    admin,
+    model_instance,
+    mock_messages,
+    _request,
+    on_error,
+):
+    """With a failure policy, other items should still be processed."""
+    instances = [model_instance() for _ in range(3)]
+    r = _request("post", data={ACTION_CHECKBOX_NAME: [i.pk for i in instances]})
+    failing_pk = instances[1].pk
+
+    def _function(pk):
+        if pk == failing_pk:
+            raise RuntimeError("boom")
+
+    queue_action = _AdminAction(_function, on_error=on_error)
+    response = queue_action(admin, r, AdminActionsTestModel.objects.all())
+
+    message = mock_messages.call_args[0][1]
+    assert "for 2 " in message
+    assert "1 failed" in message
+    if on_error == "collect":
+        assert response["Content-Type"] == "text/csv"
+        assert "attachment" in response["Content-Disposition"]
+        assert response.content.decode().splitlines() == [
+            "pk,error",
+            f"{failing_pk},RuntimeError: boom",
+        ]
+    else:
+        assert response is None
+
+
+@pytest.mark.django_db
+def test_failing_batch_fails_every_item(model_instance):
+    """If handle_batch raises, the whole batch should count as failed."""
+    model_instance()
+    model_instance()
+
+    class _BatchAdminAction(_AdminAction):
+        def handle_batch(self, items):
+            raise RuntimeError("boom")
+
+    result = _BatchAdminAction(lambda _: ..., on_error="skip").run(
+        AdminActionsTestModel.objects.all()
+    )
+
+    assert result.processed == 0
+    assert result.failed == 2
+
+
+def test_unknown_failure_policy_raises():
+    """An unknown failure policy should raise an error."""
+    with pytest.raises(ValueError):
+        # noinspection PyTypeChecker
+        _AdminAction(lambda _: ..., on_error="ignore")  # pyright: ignore[reportArgumentType]
+
+
+@pytest.mark.django_db
+def test_atomic_batches_roll_back_failed_items(model_instance):
+    """Each batch should be a transaction, with a savepoint per item."""
+    instances = [model_instance() for _ in range(3)]
+    failing_pk = instances[1].pk
+    in_transaction = []
+
+    def _function(pk):
+        in_transaction.append(transaction.get_connection().in_atomic_block)
+        AdminActionsTestModel.objects.filter(pk=pk).update(name="handled")
+        if pk == failing_pk:
+            raise RuntimeError("boom")
+
+    queue_action = _AdminAction(_function, atomic=True, chunk_size=2, on_error="skip")
+    result = queue_action.run(AdminActionsTestModel.objects.order_by("pk"))
+
+    assert result.processed == 2
+    assert all(in_transaction)
+    assert list(
+        AdminActionsTestModel.objects.order_by("pk").values_list("name", flat=True)
+    ) == ["handled", instances[1].name, "handled"]
+
+
+def test_atomic_without_chunk_size_raises():
+    """A transaction over the whole selection should be refused."""
+    with pytest.raises(ValueError, match="chunk_size"):
+        _AdminAction(lambda _: ..., atomic=True)
+
+
+@pytest.mark.django_db
+def test_atomic_batch_is_rolled_back_when_raising(model_instance):
+    """With on_error="raise", the failing batch's writes should be undone."""
+    instances = [model_instance() for _ in range(2)]
+
+    def _function(pk):
+        AdminActionsTestModel.objects.filter(pk=pk).update(name="handled")
+        if pk == instances[1].pk:
+            raise RuntimeError("boom")
+
+    queue_action = _AdminAction(_function, atomic=True, chunk_size=2)
+    with pytest.raises(RuntimeError):
+        queue_action.run(AdminActionsTestModel.objects.order_by("pk"))
+
+    assert not AdminActionsTestModel.objects.filter(name="handled").exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "options", [{"only": ["parent"]}, {"defer": ["name"]}], ids=["only", "defer"]
+)
+def test_unused_columns_are_not_fetched(
+    model_instance, mock_function, django_assert_num_queries, options
+):
+    """Fields left out with only or defer should not be selected."""
+    model_instance()
+
+    queue_action = _AdminAction(mock_function, condition=lambda _: True, **options)
+    with django_assert_num_queries(1) as captured:
+        queue_action.run(AdminActionsTestModel.objects.all())
+
+    assert '"name"' not in captured.captured_queries[0]["sql"]
+    mock_function.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_ordering_and_annotations_are_stripped(
+    model_instance, mock_function, django_assert_num_queries
+):
+    """The admin's annotations and ordering should be dropped on request."""
+    instances = [model_instance() for _ in range(2)]
+    queryset = AdminActionsTestModel.objects.annotate(
+        num_children=Count("children")
+    ).order_by("-num_children", "-pk")
+
+    queue_action = _AdminAction(
+        mock_function, strip_annotations=True, clear_ordering=True
+    )
+    with django_assert_num_queries(1) as captured:
+        queue_action.run(queryset)
+
+    sql = captured.captured_queries[0]["sql"]
+    assert "COUNT" not in sql
+    assert "JOIN" not in sql
+    assert "GROUP BY" not in sql
+    assert "ORDER BY" not in sql
+    assert sorted(c.args[0] for c in mock_function.call_args_list) == sorted(
+        i.pk for i in instances
+    )
+
+
+@pytest.mark.django_db
+def test_stripping_annotations_keeps_plain_ordering(model_instance, mock_function):
+    """Ordering that doesn't use an annotation should survive stripping."""
+    instances = [model_instance() for _ in range(3)]
+    queryset = AdminActionsTestModel.objects.annotate(
+        num_children=Count("children")
+    ).order_by("num_children", "-pk")
+
+    _AdminAction(mock_function, strip_annotations=True).run(queryset)
+
+    assert [c.args[0] for c in mock_function.call_args_list] == [
+        i.pk for i in reversed(instances)
+    ]
+
+
+@pytest.mark.django_db
+def test_filtered_annotations_are_stripped_with_a_subquery(
+    model_instance, mock_function, django_assert_num_queries
+):
+    """A filter on an annotation should still select the same rows."""
+    parent = model_instance()
+    model_instance()
+    AdminActionsTestModel.objects.create(name="child", parent=parent)
+    queryset = AdminActionsTestModel.objects.annotate(
+        num_children=Count("children")
+    ).filter(num_children__gt=0)
+
+    queue_action = _AdminAction(mock_function, strip_annotations=True)
+    with django_assert_num_queries(1) as captured:
+        queue_action.run(queryset)
+
+    sql = captured.captured_queries[0]["sql"]
+    assert "COUNT" in sql.split(" IN ")[1]  # Only in the pk subquery
+    mock_function.assert_called_once_with(parent.pk)
+
+
+def test_actions_are_slotted(mock_function):
+    """Provided actions shouldn't carry a __dict__, but still take Django's
+    optional action attributes."""
+    from django.contrib import admin as django_admin
+
+    from action_hero.actions import QuerySetAction, SimpleAction
+
+    for action in (
+        SimpleAction(mock_function),
+        QuerySetAction(mock_function, name="set_based"),
+    ):
+        assert not hasattr(action, "__dict__")
+        with pytest.raises(AttributeError):
+            action.unknown_option = True
+
+    action = django_admin.action(permissions=["change"], description="Change")(
+        SimpleAction(mock_function)
+    )
+    assert action.allowed_permissions == ["change"]
+    assert action.short_description == "Change"
+
+
+def test_model_names_are_cached_per_language(mock_function):
+    """Model names should be computed once per model and language."""
+    from django.utils import translation
+
+    from action_hero.lib import _model_names
+
+    action = _AdminAction(mock_function)
+    _model_names.cache_clear()
+
+    opts = AdminActionsTestModel._meta
+    assert action.get_model_name(AdminActionsTestModel, 1) == (
+        str(opts.verbose_name).title()
+    )
+    assert action.get_model_name(AdminActionsTestModel, 2) == (
+        str(opts.verbose_name_plural).title()
+    )
+    assert _model_names.cache_info().misses == 1
+    with translation.override("de"):
+        action.get_model_name(AdminActionsTestModel, 2)
+    assert _model_names.cache_info().misses == 2
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.messages import SUCCESS, WARNING
+
+from action_hero.actions import AsyncAction
+from tests.app.models import AdminActionsTestModel
+
+
+@pytest.mark.django_db
+def test_coroutine_is_awaited_concurrently(
+    admin,
+    model_instance,
+    mock_messages,
+    _request,
+):
+    """Every record should be awaited, with bounded concurrency."""
+    instances = [model_instance() for _ in range(5)]
+    r = _request(method="post", data={ACTION_CHECKBOX_NAME: [i.pk for i in instances]})
+    handled = []
+    in_flight = 0
+    peak = 0
+
+    async def _function(pk):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        handled.append(pk)
+
+    async_action = AsyncAction(_function, max_concurrency=2)
+    async_action(admin, r, AdminActionsTestModel.objects.all())
+
+    assert sorted(handled) == sorted(i.pk for i in instances)
+    assert peak == 2
+    assert mock_messages.call_args[0][2] == SUCCESS
+
+
+@pytest.mark.django_db
+def test_failures_are_counted_not_raised(
+    admin,
+    model_instance,
+    mock_messages,
+    _request,
+):
+    """A failing coroutine should not stop the others, and should be reported."""
+    instances = [model_instance() for _ in range(3)]
+    r = _request(method="post", data={ACTION_CHECKBOX_NAME: [i.pk for i in instances]})
+
+    async def _function(pk):
+        if pk == instances[0].pk:
+            raise RuntimeError("Downstream API is down.")
+
+    async_action = AsyncAction(_function)
+    async_action(admin, r, AdminActionsTestModel.objects.all())
+
+    message = mock_messages.call_args[0][1]
+    assert "for 2 " in message
+    assert "1 failed" in message
+    assert mock_messages.call_args[0][2] == WARNING
+
+
+@pytest.mark.django_db
+def test_handle_item_awaits_function(model_instance):
+    """Calling handle_item directly should await the function."""
+    instance = model_instance()
+    handled = []
+
+    async def _function(pk):
+        handled.append(pk)
+
+    AsyncAction(_function).handle_item(instance)
+
+    assert handled == [instance.pk]
+
+
+def test_sync_function_raises():
+    """Providing a regular function should raise an error."""
+    with pytest.raises(TypeError):
+        AsyncAction(lambda _: ...)  # pyright: ignore[reportArgumentType]
+
+
+def test_nonpositive_max_concurrency_raises():
+    """At least one call must be allowed in flight."""
+
+    async def _function(pk): ...
+
+    with pytest.raises(ValueError):
+        AsyncAction(_function, max_concurrency=0)
@@ -0,0 +1,140 @@
+from unittest import mock
+
+import pytest
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.messages import INFO
+
+from action_hero import lib
+from action_hero.actions import SimpleAction
+from action_hero.backends import CeleryBackend, InlineBackend, ThreadBackend
+from action_hero.lib import run_deferred
+from tests.app.models import AdminActionsTestModel
+
+
+@pytest.mark.django_db
+def test_deferred_action_returns_before_running(
+    admin,
+    model_instance,
+    mock_function,
+    mock_messages,
+    _request,
+):
+    """A deferred action should only submit the pks and tell the user."""
+    instance = model_instance()
+    r = _request("post", data={ACTION_CHECKBOX_NAME: [instance.pk]})
+    backend = mock.Mock(spec=InlineBackend)
+
+    action = SimpleAction(mock_function, name="deferred_mock", backend=backend)
+    action(admin, r, AdminActionsTestModel.objects.all())
+
+    backend.submit.assert_called_once_with(
+        "deferred_mock", "app.AdminActionsTestModel", [instance.pk], run_id=mock.ANY
+    )
+    mock_function.assert_not_called()
+    mock_messages.assert_called_once()
+    assert "background" in mock_messages.call_args[0][1]
+    assert mock_messages.call_args[0][2] == INFO
+
+
+@pytest.mark.django_db
+def test_inline_backend_runs_action(
+    admin,
+    model_instance,
+    mock_function,
+    _request,
+):
+    """The inline backend should run the whole action, in chunks."""
+    instances = [model_instance() for _ in range(3)]
+    r = _request("post", data={ACTION_CHECKBOX_NAME: [i.pk for i in instances]})
+
+    action = SimpleAction(
+        mock_function, name="deferred_inline", chunk_size=2, backend=InlineBackend()
+    )
+    action(admin, r, AdminActionsTestModel.objects.all())
+
+    mock_function.assert_has_calls([mock.call(i.pk) for i in instances], any_order=True)
+    assert mock_function.call_count == 3
+
+
+@pytest.mark.django_db(transaction=True)
+def test_thread_backend_runs_action_in_thread(model_instance, mock_function):
+    """The thread backend should run the action outside the calling thread."""
+    instance = model_instance()
+
+    SimpleAction(mock_function, name="deferred_thread", backend=ThreadBackend())
+    thread = ThreadBackend().submit(
+        "deferred_thread", "app.AdminActionsTestModel", [instance.pk]
+    )
+    thread.join()
+
+    mock_function.assert_called_once_with(instance.pk)
+
+
+@pytest.mark.django_db
+def test_celery_backend_queues_orchestrator(model_instance, mock_function):
+    """The Celery backend should queue one task with the captured pks."""
+    instance = model_instance()
+    task = mock.Mock()
+
+    SimpleAction(mock_function, name="deferred_celery", backend=CeleryBackend(task))
+    CeleryBackend(task, queue="admin").submit(
+        "deferred_celery", "app.AdminActionsTestModel", [instance.pk]
+    )
+
+    task.apply_async.assert_called_once_with(
+        ("deferred_celery", "app.AdminActionsTestModel", [instance.pk], None),
+        queue="admin",
+    )
+
+
+def test_unknown_deferred_action_raises():
+    """Running an action that was never created should raise an error."""
+    with pytest.raises(LookupError):
+        run_deferred("no_such_action", "app.AdminActionsTestModel", [1])
+
+
+def test_duplicate_deferred_name_raises():
+    """Two deferred actions with the same name should not replace each other."""
+    first = SimpleAction(lambda pk: None, backend=InlineBackend())
+
+    with pytest.raises(ValueError, match="<lambda>"):
+        SimpleAction(lambda pk: None, backend=InlineBackend())
+
+    assert lib._deferred_actions["<lambda>"] is first
+
+
+def test_non_backend_raises():
+    """Providing something other than a DeferredBackend should raise an error."""
+    with pytest.raises(TypeError):
+        # noinspection PyTypeChecker
+        SimpleAction(lambda _: ..., backend=object())  # pyright: ignore[reportArgumentType]
+
+
+@pytest.mark.django_db
+def test_celery_backend_task_runs_action(model_instance, mock_function):
+    """The provided Celery task should run the deferred action."""
+    from action_hero.backends.queue_celery import run_deferred_task
+
+    instance = model_instance()
+    SimpleAction(mock_function, name="deferred_task", backend=InlineBackend())
+
+    result = run_deferred_task.apply(
+        ("deferred_task", "app.AdminActionsTestModel", [instance.pk])
+    )
+
+    assert result.get() == 1
+    mock_function.assert_called_once_with(instance.pk)
+
+
+def test_celery_not_available(monkeypatch):
+    """Without Celery installed, `action_hero.backends` should not include `CeleryBackend`."""
+    import sys
+    from importlib import reload
+
+    monkeypatch.delitem(sys.modules, "action_hero.backends.queue_celery", raising=False)
+    monkeypatch.setitem(sys.modules, "celery", None)
+
+    import action_hero.backends
+
+    reload(action_hero.backends)
+    assert "CeleryBackend" not in action_hero.backends.__all__
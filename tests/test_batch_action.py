@@ -0,0 +1,57 @@
+from unittest import mock
+
+import pytest
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+
+from action_hero.actions import BatchAction
+from tests.app.models import AdminActionsTestModel
+
+
+@pytest.mark.django_db
+def test_function_is_called_per_batch(
+    admin,
+    model_instance,
+    mock_function,
+    mock_messages,
+    _request,
+):
+    """The function should be called once per batch with a list of pks."""
+    instances = [model_instance() for _ in range(3)]
+    r = _request(method="post", data={ACTION_CHECKBOX_NAME: [i.pk for i in instances]})
+
+    batch_action = BatchAction(mock_function, chunk_size=2)
+    batch_action(admin, r, AdminActionsTestModel.objects.order_by("pk"))
+
+    assert mock_function.call_args_list == [
+        mock.call([instances[0].pk, instances[1].pk]),
+        mock.call([instances[2].pk]),
+    ]
+    mock_messages.assert_called_once()
+    assert "3" in mock_messages.call_args[0][1]
+
+
+@pytest.mark.django_db
+def test_unchunked_selection_is_one_batch(
+    admin,
+    model_instance,
+    mock_function,
+    _request,
+):
+    """Without a chunk_size, every record should be passed in one call."""
+    instances = [model_instance() for _ in range(3)]
+    r = _request(method="post", data={ACTION_CHECKBOX_NAME: [i.pk for i in instances]})
+
+    batch_action = BatchAction(mock_function)
+    batch_action(admin, r, AdminActionsTestModel.objects.order_by("pk"))
+
+    mock_function.assert_called_once_with([i.pk for i in instances])
+
+
+@pytest.mark.django_db
+def test_handle_item_is_a_single_item_batch(model_instance, mock_function):
+    """Calling handle_item directly should pass a one-item list."""
+    instance = model_instance()
+
+    BatchAction(mock_function).handle_item(instance)
+
+    mock_function.assert_called_once_with([instance.pk])
@@ -0,0 +1,83 @@
+from unittest import mock
+
+import pytest
+
+from action_hero.actions import BatchAction, SimpleAction
+from action_hero.metrics import InMemorySink
+from tests.app.models import AdminActionsTestModel
+
+
+@pytest.mark.django_db
+def test_batch_condition_masks_pks(model_instance, mock_function):
+    """Only the pks passing the mask should reach the handler, in chunks."""
+    instances = [model_instance() for _ in range(5)]
+    keep = {instances[1].name, instances[3].name}
+    chunks = []
+
+    def _by_name(columns):
+        chunks.append(columns)
+        return [name in keep for name in columns["name"]]
+
+    action = BatchAction(
+        mock_function,
+        batch_condition=_by_name,
+        batch_fields=["name"],
+        chunk_size=2,
+    )
+    result = action.run(AdminActionsTestModel.objects.order_by("pk"))
+
+    assert result.processed == 2
+    assert [pk for call in mock_function.call_args_list for pk in call.args[0]] == [
+        instances[1].pk,
+        instances[3].pk,
+    ]
+    assert [len(columns["pk"]) for columns in chunks] == [2, 2, 1]
+    assert set(chunks[0]) == {"pk", "name"}
+
+
+@pytest.mark.django_db
+def test_batch_condition_loads_instances_for_callable_conditions(model_instance):
+    """A callable condition should still see model instances after the mask."""
+    instances = [model_instance() for _ in range(3)]
+    seen = []
+    sink = InMemorySink()
+
+    action = SimpleAction(
+        lambda pk: None,
+        name="masked",
+        batch_condition=lambda columns: [pk != instances[0].pk for pk in columns["pk"]],
+        condition=lambda record: seen.append(record) or True,
+        metrics=sink,
+    )
+    action.run(AdminActionsTestModel.objects.order_by("pk"))
+
+    assert seen == instances[1:]
+    assert sink.runs[0].skipped == 1
+
+
+@pytest.mark.django_db
+def test_batch_condition_with_numpy_columns(model_instance, mock_function):
+    """NumPy columns should allow a vectorized mask."""
+    pytest.importorskip("numpy")
+    instances = [model_instance() for _ in range(4)]
+
+    action = SimpleAction(
+        mock_function,
+        batch_condition=lambda columns: columns["pk"] % 2 == 0,
+        batch_columns="numpy",
+    )
+    action.run(AdminActionsTestModel.objects.all())
+
+    assert sorted(call.args[0] for call in mock_function.call_args_list) == [
+        i.pk for i in instances if i.pk % 2 == 0
+    ]
+
+
+def test_invalid_batch_condition_raises(mock_function):
+    """Bad batch condition options should raise an error."""
+    with pytest.raises(TypeError):
+        SimpleAction(mock_function, batch_condition="pk > 1")
+    with pytest.raises(ValueError):
+        SimpleAction(mock_function, batch_condition=bool, batch_columns="arrow")
+    with mock.patch.dict("sys.modules", {"numpy": None}), pytest.raises(ImportError):
+        SimpleAction(mock_function, batch_condition=bool, batch_columns="numpy")
@@ -0,0 +1,159 @@
+"""Throughput, memory and query-count benchmarks for running actions.
+
+Only 1,000 rows are used by default, to keep the regular test run fast. Set
+``ACTION_HERO_BENCHMARK_SIZES`` to a comma-separated list of row counts to
+benchmark larger datasets, and ``ACTION_HERO_BENCHMARK_OUTPUT`` to a file path
+to append each result to as a JSON line, e.g.::
+
+    ACTION_HERO_BENCHMARK_SIZES=1000,100000,1000000 \\
+    ACTION_HERO_BENCHMARK_OUTPUT=bench.jsonl \\
+    pytest -m benchmark --no-cov -s
+"""
+
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import celery
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from action_hero.actions import QueueCeleryAction, SimpleAction
+from action_hero.metrics import InMemorySink
+from tests.app.models import AdminActionsTestModel
+
+pytestmark = pytest.mark.benchmark
+
+SIZES = [
+    int(size)
+    for size in os.environ.get("ACTION_HERO_BENCHMARK_SIZES", "1000").split(",")
+]
+CHUNK_SIZE = 2000
+
+app = celery.Celery("benchmarks", set_as_current=False)
+app.conf.update(broker_url="memory://", task_always_eager=True)
+
+
+@app.task
+def noop_task(pk_or_pks):
+    """A task that does nothing, to measure dispatch overhead only."""
+
+
+def noop(pk):
+    """A function that does nothing, to measure action overhead only."""
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"{size}_rows")
+def rows(request, db) -> int:
+    """Fill the test model's table with the requested number of rows."""
+    size = request.param
+    AdminActionsTestModel.objects.bulk_create(
+        (AdminActionsTestModel(name=f"row {i}") for i in range(size)),
+        batch_size=10_000,
+    )
+    return size
+
+
+def _measure(action, rows, record_property) -> dict:
+    """Run the action over every row, recording time, memory and queries."""
+    sink = InMemorySink()
+    action.metrics = sink
+    queryset = AdminActionsTestModel.objects.all()
+
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            result = action.run(queryset)
+            seconds = time.perf_counter() - started
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert result.processed == rows
+    measurement = {
+        "action": action.name,
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds,
+        "peak_bytes": peak_bytes,
+        "queries": len(queries),
+        **sink.runs[0].summary(),
+    }
+    _record(measurement, record_property)
+    return measurement
+
+
+def _record(measurement: dict, record_property) -> None:
+    """Record a measurement on the test and in the output file, if any."""
+    for key, value in measurement.items():
+        record_property(key, value)
+    if path := os.environ.get("ACTION_HERO_BENCHMARK_OUTPUT"):
+        with open(path, "a") as output:
+            output.write(json.dumps(measurement) + "\n")
+
+
+def test_simple_action_hydrating_instances(rows, record_property):
+    """Baseline: a callable condition forces every instance to be built."""
+    action = SimpleAction(noop, condition=lambda _: True, name="simple_instances")
+
+    measurement = _measure(action, rows, record_property)
+
+    assert measurement["queries"] == 1
+
+
+def test_simple_action_streaming_pks(rows, record_property):
+    """Streaming primary keys in chunks should keep queries and memory flat."""
+    action = SimpleAction(noop, chunk_size=CHUNK_SIZE, name="simple_pks")
+
+    measurement = _measure(action, rows, record_property)
+
+    assert measurement["queries"] <= 1 + math.ceil(rows / CHUNK_SIZE)
+
+
+@pytest.mark.parametrize("dispatch", ["delay", "group", "batch"])
+def test_queue_celery_action(rows, record_property, dispatch):
+    """Queue every row through an eager Celery app with each dispatch mode."""
+    action = QueueCeleryAction(
+        noop_task, chunk_size=CHUNK_SIZE, dispatch=dispatch, name=f"celery_{dispatch}"
+    )
+
+    measurement = _measure(action, rows, record_property)
+
+    assert measurement["queries"] <= 1 + math.ceil(rows / CHUNK_SIZE)
+
+
+IMPORT_SCRIPT = """
+import json, sys, time
+from django.conf import settings
+settings.configure()
+import django
+django.setup()
+started = time.perf_counter()
+import action_hero.actions, action_hero.backends
+seconds = time.perf_counter() - started
+print(json.dumps({"seconds": seconds, "celery": "celery" in sys.modules}))
+"""
+
+
+def test_import_time(record_property):
+    """Importing the action packages in a fresh process shouldn't import Celery
+    or any action's dependencies."""
+    src = Path(__file__).parent.parent / "src"
+    completed = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        capture_output=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": str(src)},
+        text=True,
+    )
+    result = json.loads(completed.stdout)
+
+    _record({"action": "import", **result}, record_property)
+    assert not result["celery"]
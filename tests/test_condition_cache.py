@@ -0,0 +1,96 @@
+from unittest import mock
+
+import pytest
+
+from action_hero.actions import SimpleAction
+from action_hero.condition_cache import (
+    CachedCondition,
+    DjangoConditionCache,
+    LocalConditionCache,
+)
+from tests.app.models import AdminActionsTestModel
+
+
+@pytest.mark.django_db
+def test_repeated_keys_skip_the_check(model_instance, mock_function):
+    """Records sharing a key should reuse the result, across runs too."""
+    parent = model_instance()
+    for _ in range(3):
+        AdminActionsTestModel.objects.create(name="child", parent=parent)
+    check = mock.Mock(return_value=True)
+
+    condition = CachedCondition(
+        check, key=lambda record: record.parent_id, namespace="entitled"
+    )
+    action = SimpleAction(mock_function, condition=condition)
+    action.run(AdminActionsTestModel.objects.all())
+    action.run(AdminActionsTestModel.objects.all())
+
+    assert check.call_count == 2  # The parent's key (None), and the children's
+    assert (condition.hits, condition.misses) == (6, 2)
+    assert mock_function.call_count == 8
+
+
+def test_local_cache_is_bounded():
+    """The local cache should drop the least recently used and expired
+    results."""
+    cache = LocalConditionCache(maxsize=2)
+    cache.set("a", True)
+    cache.set("b", False)
+    assert cache.get("a") is True
+    cache.set("c", True)
+    assert cache.get("b") is None
+    assert cache.get("a") is True
+
+    with mock.patch(
+        "action_hero.condition_cache.time.monotonic", side_effect=[0.0, 11.0]
+    ):
+        cache = LocalConditionCache(ttl=10)
+        cache.set("a", True)
+        assert cache.get("a") is None
+
+
+def test_django_cache_shares_results():
+    """Two wrappers with the same namespace should share Django cache results."""
+    check = mock.Mock(return_value=False)
+    cache = DjangoConditionCache(key_prefix="test:condition_cache:")
+
+    first = CachedCondition(check, key=str, cache=cache, namespace="shared")
+    second = CachedCondition(check, key=str, cache=cache, namespace="shared")
+
+    assert first("record") is False
+    assert second("record") is False
+    check.assert_called_once()
+
+
+def test_lambdas_sharing_a_cache_need_namespaces():
+    """Lambdas have no unique name, so each needs its own namespace."""
+    cache = LocalConditionCache()
+
+    with pytest.raises(ValueError, match="namespace"):
+        CachedCondition(lambda record: True, key=str, cache=cache)
+
+    truthy = CachedCondition(lambda record: True, key=str, cache=cache, namespace="t")
+    falsy = CachedCondition(lambda record: False, key=str, cache=cache, namespace="f")
+
+    assert truthy("record") is True
+    assert falsy("record") is False
+
+
+def test_default_namespace_is_module_and_qualname():
+    """A named condition should be kept apart by its module and qualname."""
+    condition = CachedCondition(bool, key=str)
+
+    assert condition.namespace == "builtins.bool"
+
+
+def test_invalid_cached_condition_raises():
+    """Bad arguments should raise an error."""
+    with pytest.raises(TypeError):
+        CachedCondition(bool, key="account_id")
+    with pytest.raises(TypeError):
+        CachedCondition(bool, key=str, cache={})
+    with pytest.raises(ValueError):
+        LocalConditionCache(maxsize=0)
+    with pytest.raises(ValueError):
+        LocalConditionCache(ttl=0)
@@ -0,0 +1,112 @@
+import warnings
+
+import pytest
+
+from action_hero.actions import SimpleAction
+from action_hero.diagnostics import QueryBudgetExceeded, QueryBudgetWarning
+from tests.app.models import AdminActionsTestModel
+
+
+@pytest.fixture
+def children(model_instance) -> list[AdminActionsTestModel]:
+    """Create records that each have a parent record."""
+    instances = []
+    for _ in range(3):
+        instance = model_instance()
+        instance.parent = model_instance()
+        instance.save()
+        instances.append(instance)
+    return instances
+
+
+def _has_parent(record) -> bool:
+    """A condition that reads a related object."""
+    return record.parent is not None
+
+
+@pytest.mark.django_db
+def test_n_plus_one_condition_warns(children, mock_function):
+    """A condition querying once per item should be flagged, once."""
+    action = SimpleAction(mock_function, condition=_has_parent, query_budget=0)
+
+    with pytest.warns(QueryBudgetWarning, match="The condition made 1 queries") as w:
+        action.run(AdminActionsTestModel.objects.filter(parent__isnull=False))
+
+    assert len(w) == 1
+    assert mock_function.call_count == len(children)
+
+
+@pytest.mark.django_db
+def test_select_related_avoids_n_plus_one(
+    children, mock_function, django_assert_num_queries
+):
+    """Declaring select_related on the action should fetch parents up front."""
+    action = SimpleAction(
+        mock_function,
+        condition=_has_parent,
+        query_budget=0,
+        select_related=["parent"],
+    )
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", QueryBudgetWarning)
+        with django_assert_num_queries(1):
+            action.run(AdminActionsTestModel.objects.filter(parent__isnull=False))
+
+    assert mock_function.call_count == len(children)
+
+
+@pytest.mark.django_db
+def test_prefetch_related_avoids_n_plus_one(children, mock_function):
+    """Declaring prefetch_related on the action should prefetch per chunk."""
+    action = SimpleAction(
+        mock_function,
+        condition=lambda record: len(record.children.all()) >= 0,
+        query_budget=0,
+        prefetch_related=["children"],
+        chunk_size=10,
+        on_query_budget="raise",
+    )
+
+    action.run(AdminActionsTestModel.objects.filter(parent__isnull=True))
+
+    assert mock_function.call_count == len(children)
+
+
+@pytest.mark.django_db
+def test_n_plus_one_handler_raises(children):
+    """Handlers over budget should raise when asked to."""
+
+    def _function(pk):
+        AdminActionsTestModel.objects.get(pk=pk)
+
+    action = SimpleAction(_function, query_budget=0, on_query_budget="raise")
+
+    with pytest.raises(QueryBudgetExceeded, match="handle_item"):
+        action.run(AdminActionsTestModel.objects.all())
+
+
+@pytest.mark.django_db
+def test_skipped_budget_failures_are_reported(children):
+    """With on_error="skip", items over budget should count as failures."""
+
+    def _function(pk):
+        AdminActionsTestModel.objects.get(pk=pk)
+
+    action = SimpleAction(
+        _function, query_budget=0, on_query_budget="raise", on_error="skip"
+    )
+    result = action.run(AdminActionsTestModel.objects.filter(parent__isnull=False))
+
+    assert result.processed == 0
+    assert result.failed == len(children)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"query_budget": -1}, {"query_budget": 1, "on_query_budget": "ignore"}],
+)
+def test_invalid_query_budget_raises(options):
+    """Negative budgets and unknown policies should be rejected."""
+    with pytest.raises(ValueError):
+        SimpleAction(lambda _: ..., **options)
@@ -0,0 +1,95 @@
+import logging
+from unittest import mock
+
+import pytest
+
+from action_hero.actions import BatchAction, SimpleAction
+from action_hero.metrics import InMemorySink, LoggingSink, RunMetrics, StatsdSink
+from tests.app.models import AdminActionsTestModel
+
+
+@pytest.mark.django_db
+def test_in_memory_sink_collects_run_metrics(model_instance, mock_function):
+    """A run should record its timings and counts in the sink."""
+    instances = [model_instance() for _ in range(3)]
+    sink = InMemorySink()
+
+    action = SimpleAction(
+        mock_function,
+        condition=lambda record: record.pk != instances[0].pk,
+        metrics=sink,
+    )
+    action.run(AdminActionsTestModel.objects.all())
+
+    (metrics,) = sink.runs
+    assert metrics.action == "empty_function"
+    assert metrics.model == "app.AdminActionsTestModel"
+    assert (metrics.processed, metrics.skipped, metrics.failed) == (2, 1, 0)
+    assert len(metrics.handle_seconds) == 2
+    assert len(metrics.batch_seconds) == 1
+    assert metrics.fetch_seconds > 0
+    assert metrics.condition_seconds > 0
+    assert metrics.total_seconds >= metrics.fetch_seconds + metrics.condition_seconds
+    assert 0 < metrics.handle_p50 <= metrics.handle_p95 <= metrics.handle_max
+
+    sink.clear()
+    assert sink.runs == []
+
+
+@pytest.mark.django_db
+def test_batch_timings_stand_in_for_item_timings(model_instance, mock_function):
+    """Actions that handle whole batches should report per-batch timings."""
+    model_instance()
+    model_instance()
+    sink = InMemorySink()
+
+    BatchAction(mock_function, chunk_size=1, metrics=sink).run(
+        AdminActionsTestModel.objects.all()
+    )
+
+    (metrics,) = sink.runs
+    assert len(metrics.handle_seconds) == 0
+    assert len(metrics.batch_seconds) == 2
+    assert metrics.handle_max == max(metrics.batch_seconds)
+
+
+def test_percentiles():
+    """Percentiles should use the nearest-rank method."""
+    metrics = RunMetrics("action", "app.Model")
+    assert metrics.handle_p95 == 0.0
+
+    metrics.handle_seconds.extend(i / 100 for i in range(1, 101))
+    assert metrics.handle_p50 == 0.5
+    assert metrics.handle_p95 == 0.95
+    assert metrics.handle_max == 1.0
+
+
+def test_logging_sink_logs_summary(caplog):
+    """The logging sink should log a summary with the metrics attached."""
+    metrics = RunMetrics("action", "app.Model", processed=3)
+
+    with caplog.at_level(logging.INFO, logger="action_hero.metrics"):
+        LoggingSink().record(metrics)
+
+    (record,) = caplog.records
+    assert "action on app.Model: 3 processed" in record.getMessage()
+    assert record.action_hero_metrics["processed"] == 3
+
+
+def test_statsd_sink_sends_timings_and_counts():
+    """The statsd sink should send timings in milliseconds and counts."""
+    client = mock.Mock()
+    metrics = RunMetrics("action", "app.Model", total_seconds=2.0, failed=1)
+
+    StatsdSink(client, prefix="admin").record(metrics)
+
+    client.timing.assert_any_call("admin.action.total", 2000.0)
+    client.timing.assert_any_call("admin.action.handle_p95", 0.0)
+    client.incr.assert_any_call("admin.action.failed", 1)
+
+
+def test_non_sink_raises():
+    """Providing something other than a MetricsSink should raise an error."""
+    with pytest.raises(TypeError):
+        # noinspection PyTypeChecker
+        SimpleAction(lambda _: ..., metrics=[])  # pyright: ignore[reportArgumentType]
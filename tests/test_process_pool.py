@@ -0,0 +1,96 @@
+import multiprocessing
+from unittest import mock
+
+import pytest
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.messages import SUCCESS, WARNING
+
+from action_hero.actions import ProcessPoolAction
+from action_hero.backends import InlineBackend
+from action_hero.lib import run_deferred
+from tests.app.models import AdminActionsTestModel
+
+
+def _in_worker_process(pk):
+    """Fails unless it runs in a child process."""
+    if multiprocessing.parent_process() is None:
+        raise RuntimeError("Called in the admin process.")
+
+
+def _odd_pks_only(pk):
+    """Fails for even primary keys."""
+    if pk % 2 == 0:
+        raise ValueError(f"{pk} is even.")
+
+
+@pytest.mark.django_db
+def test_function_is_called_in_worker_processes(
+    admin,
+    model_instance,
+    mock_messages,
+    _request,
+):
+    """Every record should be handled by a worker process."""
+    instances = [model_instance() for _ in range(4)]
+    r = _request(method="post", data={ACTION_CHECKBOX_NAME: [i.pk for i in instances]})
+
+    pool_action = ProcessPoolAction(_in_worker_process, max_workers=2)
+    pool_action(admin, r, AdminActionsTestModel.objects.all())
+
+    mock_messages.assert_called_once()
+    assert "for 4 " in mock_messages.call_args[0][1]
+    assert mock_messages.call_args[0][2] == SUCCESS
+
+
+@pytest.mark.django_db
+def test_failures_are_gathered(
+    admin,
+    model_instance,
+    mock_messages,
+    _request,
+):
+    """Exceptions raised in workers should be reported, not raised."""
+    instances = [model_instance() for _ in range(4)]
+    r = _request(method="post", data={ACTION_CHECKBOX_NAME: [i.pk for i in instances]})
+
+    pool_action = ProcessPoolAction(_odd_pks_only, max_workers=2, chunk_size=2)
+    result = pool_action.run(AdminActionsTestModel.objects.all())
+
+    assert result.processed == 2
+    assert sorted(pk for pk, _ in result.failures) == [
+        i.pk for i in instances if i.pk % 2 == 0
+    ]
+    assert all(isinstance(e, ValueError) for _, e in result.failures)
+
+    pool_action(admin, r, AdminActionsTestModel.objects.all())
+    assert mock_messages.call_args[0][2] == WARNING
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"max_workers": 0}, {"start_method": "fork"}, {"atomic": True}],
+)
+def test_invalid_pool_options_raise(options):
+    """Empty pools, forked workers, and transactions should be rejected."""
+    with pytest.raises(ValueError):
+        ProcessPoolAction(_odd_pks_only, **options)
+
+
+@pytest.mark.django_db
+def test_deferred_run_shares_one_pool(model_instance):
+    """A deferred run should start one pool for all of its chunks."""
+    pks = [model_instance().pk for _ in range(3)]
+    ProcessPoolAction(
+        _in_worker_process,
+        name="pooled",
+        max_workers=1,
+        chunk_size=1,
+        backend=InlineBackend(),
+    )
+
+    with mock.patch.object(
+        ProcessPoolAction, "_executor", autospec=True, wraps=ProcessPoolAction._executor
+    ) as executor:
+        assert run_deferred("pooled", "app.AdminActionsTestModel", pks) == 3
+
+    executor.assert_called_once()
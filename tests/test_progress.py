@@ -0,0 +1,355 @@
+import json
+from unittest import mock
+
+import pytest
+from django.contrib.admin import helpers
+from django.http import Http404
+from django.urls import NoReverseMatch
+
+from action_hero.actions import SimpleAction
+from action_hero.backends import InlineBackend
+from action_hero.lib import resume_deferred, run_deferred
+from action_hero.progress import (
+    CacheProgressStore,
+    InMemoryProgressStore,
+    Progress,
+    ProgressStore,
+)
+from tests.app.admin import ProgressTestModelAdmin, progress_store
+from tests.app.models import AdminActionsTestModel
+
+
+def _spy_store() -> mock.Mock:
+    """An in-memory store that records every save."""
+    return mock.Mock(spec=ProgressStore, wraps=InMemoryProgressStore())
+
+
+@pytest.mark.django_db
+def test_run_saves_progress_after_each_batch(model_instance, mock_function):
+    """A run should save its progress as it starts, after each batch, and as
+    it finishes."""
+    for _ in range(3):
+        model_instance()
+    store = _spy_store()
+
+    action = SimpleAction(mock_function, chunk_size=2, progress_store=store)
+    with action.track_progress("run", "app.AdminActionsTestModel", 3) as progress:
+        action.run(AdminActionsTestModel.objects.all(), progress=progress)
+
+    saved = [c.args[0] for c in store.save.call_args_list]
+    assert len(saved) == 4
+    assert {progress.run_id for progress in saved} == {"run"}
+    progress = store.get("run")
+    assert progress.total == 3
+    assert (progress.processed, progress.failed) == (3, 0)
+    assert progress.status == "finished"
+    assert progress.percent == 100
+
+
+@pytest.mark.django_db
+def test_inline_runs_are_not_tracked(
+    admin,
+    _request,
+    model_instance,
+    mock_function,
+    mock_messages,
+    django_assert_num_queries,
+):
+    """A run inside the admin request should neither count the selection nor
+    save progress nobody can see."""
+    instance = model_instance()
+    r = _request("post", data={helpers.ACTION_CHECKBOX_NAME: [instance.pk]})
+    store = _spy_store()
+
+    action = SimpleAction(mock_function, progress_store=store)
+    with django_assert_num_queries(1):
+        action(admin, r, AdminActionsTestModel.objects.all())
+
+    store.save.assert_not_called()
+    mock_function.assert_called_once_with(instance.pk)
+
+
+@pytest.mark.django_db
+def test_failed_run_is_marked_failed(model_instance):
+    """A run that raises should leave its progress marked as failed."""
+    model_instance()
+    store = _spy_store()
+
+    def explode(pk):
+        raise ValueError("boom")
+
+    action = SimpleAction(explode, progress_store=store)
+    with (
+        pytest.raises(ValueError),
+        action.track_progress("run", "app.AdminActionsTestModel", 1) as progress,
+    ):
+        action.run(AdminActionsTestModel.objects.all(), progress=progress)
+
+    assert store.get("run").status == "failed"
+
+
+@pytest.mark.django_db
+def test_deferred_run_links_to_its_progress(
+    admin, _request, model_instance, mock_function, mock_messages
+):
+    """A deferred run should share its run id with the backend and link to its
+    progress page."""
+    instances = [model_instance() for _ in range(2)]
+    r = _request("post", data={helpers.ACTION_CHECKBOX_NAME: [i.pk for i in instances]})
+    store = InMemoryProgressStore()
+
+    action = SimpleAction(
+        mock_function,
+        name="deferred_progress",
+        backend=InlineBackend(),
+        progress_store=store,
+    )
+    action(admin, r, AdminActionsTestModel.objects.all())
+
+    message = mock_messages.call_args[0][1]
+    assert "Follow its progress" in message
+    run_id = message.split("action-progress/")[1].split("/")[0]
+    progress = store.get(run_id)
+    assert (progress.total, progress.processed) == (2, 2)
+    assert progress.status == "finished"
+
+
+@pytest.mark.django_db
+def test_no_link_without_progress_url(
+    admin, _request, model_instance, mock_function, mock_messages
+):
+    """An admin without the progress mixin's URL should get a plain message."""
+    model_instance()
+    r = _request("post")
+
+    action = SimpleAction(
+        mock_function,
+        name="deferred_unlinked",
+        backend=InlineBackend(),
+        progress_store=InMemoryProgressStore(),
+    )
+    with mock.patch("action_hero.lib.reverse", side_effect=NoReverseMatch):
+        action(admin, r, AdminActionsTestModel.objects.all())
+
+    assert "Follow its progress" not in mock_messages.call_args[0][1]
+
+
+def test_cache_store_round_trip():
+    """The cache store should return what was saved for a run."""
+    store = CacheProgressStore(timeout=60)
+    store.save(Progress("abc", "tracked", "app.AdminActionsTestModel", 4, 1, 1))
+
+    progress = store.get("abc")
+    assert (progress.processed, progress.failed) == (1, 1)
+    assert progress.percent == 50
+    assert store.get("missing") is None
+
+
+@pytest.mark.django_db
+def test_selected_pks_are_saved_once(model_instance, mock_function):
+    """A deferred run should save its primary keys once, not with every
+    batch's counters."""
+    instances = [model_instance() for _ in range(3)]
+    pks = [instance.pk for instance in instances]
+    store = mock.Mock(spec=ProgressStore, wraps=CacheProgressStore(timeout=60))
+
+    SimpleAction(
+        mock_function,
+        name="cached_progress",
+        chunk_size=1,
+        backend=InlineBackend(),
+        progress_store=store,
+    )
+    run_deferred("cached_progress", "app.AdminActionsTestModel", pks, "cached")
+
+    store.save_pks.assert_called_once_with("cached", pks)
+    assert store.get_pks("cached") == pks
+    assert "pks" not in store.get("cached").to_dict()
+
+
+def test_progress_store_must_be_a_store(mock_function):
+    """Passing something other than a ProgressStore should raise an error."""
+    with pytest.raises(TypeError):
+        SimpleAction(mock_function, progress_store={})
+
+
+@pytest.mark.django_db
+def test_progress_view(admin_site, _request):
+    """The admin's progress view should serve JSON and a live HTML page."""
+    admin = ProgressTestModelAdmin(AdminActionsTestModel, admin_site)
+    progress_store.save(Progress("live", "tracked", "app.AdminActionsTestModel", 4))
+
+    assert "app_adminactionstestmodel_action_progress" in [
+        url.name for url in admin.get_urls()
+    ]
+
+    response = admin.action_progress_view(_request("get"), "live")
+    assert response.status_code == 200
+    assert json.loads(response.content)["percent"] == 0
+    assert json.loads(response.content)["status"] == "running"
+
+    response = admin.action_progress_view(
+        _request("get", data={"format": "html"}), "live"
+    )
+    assert b"<progress" in response.content
+    assert b'http-equiv="refresh"' in response.content
+
+    with pytest.raises(Http404):
+        admin.action_progress_view(_request("get"), "missing")
+
+
+@pytest.mark.django_db
+def test_deferred_run_resumes_from_checkpoint(model_instance):
+    """A resumed run should skip the chunks finished before it failed."""
+    instances = [model_instance() for _ in range(5)]
+    pks = [instance.pk for instance in instances]
+    store = InMemoryProgressStore()
+    calls = []
+
+    def flaky(pk):
+        calls.append(pk)
+        if pk == pks[2] and calls.count(pk) == 1:
+            raise ValueError("worker died")
+
+    SimpleAction(
+        flaky,
+        name="resumable",
+        chunk_size=2,
+        backend=InlineBackend(),
+        progress_store=store,
+    )
+    with pytest.raises(ValueError):
+        run_deferred("resumable", "app.AdminActionsTestModel", pks[::-1], "run")
+
+    progress = store.get("run")
+    assert progress.status == "failed"
+    assert progress.last_pk == pks[1]
+    assert progress.resumable
+
+    resume_deferred("resumable", "run")
+
+    assert calls == [*pks[:3], *pks[2:]]
+    progress = store.get("run")
+    assert (progress.processed, progress.failed) == (5, 0)
+    assert progress.status == "finished"
+
+
+@pytest.mark.django_db
+def test_redelivered_run_continues_from_checkpoint(model_instance, mock_function):
+    """Running the same run id again should skip the checkpointed records and
+    not count them twice."""
+    pks = [model_instance().pk for _ in range(6)]
+    store = InMemoryProgressStore()
+    SimpleAction(
+        mock_function,
+        name="redelivered",
+        chunk_size=2,
+        backend=InlineBackend(),
+        progress_store=store,
+    )
+    run_deferred("redelivered", "app.AdminActionsTestModel", pks, "again")
+    mock_function.reset_mock()
+
+    run_deferred("redelivered", "app.AdminActionsTestModel", pks, "again")
+
+    mock_function.assert_not_called()
+    progress = store.get("again")
+    assert (progress.processed, progress.total) == (6, 6)
+    assert progress.status == "finished"
+
+    progress.checkpoint_processed, progress.last_pk = 4, pks[3]
+    progress.processed, progress.status = 5, "running"  # Killed mid-chunk
+    store.save(progress)
+    run_deferred("redelivered", "app.AdminActionsTestModel", pks, "again")
+
+    assert [c.args[0] for c in mock_function.call_args_list] == pks[4:]
+    assert store.get("again").processed == 6
+
+
+@pytest.mark.django_db
+def test_only_unfinished_deferred_runs_resume(model_instance, mock_function):
+    """Finished, running, unknown, and inline runs shouldn't be resumed."""
+    instance = model_instance()
+    store = InMemoryProgressStore()
+    action = SimpleAction(
+        mock_function,
+        name="finished",
+        backend=InlineBackend(),
+        progress_store=store,
+    )
+    run_deferred("finished", "app.AdminActionsTestModel", [instance.pk], "done")
+
+    with pytest.raises(ValueError):
+        action.resume("done")
+    with pytest.raises(LookupError):
+        action.resume("missing")
+    with pytest.raises(LookupError):
+        resume_deferred("never_created", "done")
+    with pytest.raises(ValueError):
+        SimpleAction(mock_function, progress_store=store).resume("done")
+
+    store.save(
+        Progress("busy", "finished", "app.AdminActionsTestModel", 1, checkpointed=True)
+    )
+    store.save_pks("busy", [instance.pk])
+    quiet = store.get("busy")
+    quiet.updated_at -= 24 * 60 * 60
+    assert not quiet.resumable
+    with pytest.raises(ValueError):
+        action.resume("busy")
+
+
+@pytest.mark.django_db
+def test_killed_run_resumes_with_force(admin_site, _request, model_instance):
+    """A run left "running" by a killed worker should only resume when forced."""
+    instances = [model_instance() for _ in range(3)]
+    pks = [instance.pk for instance in instances]
+    admin = ProgressTestModelAdmin(AdminActionsTestModel, admin_site)
+    progress = Progress(
+        "killed", "tracked", "app.AdminActionsTestModel", 3, 2, checkpointed=True
+    )
+    progress.checkpoint(pks[1])
+    progress_store.save(progress)
+    progress_store.save_pks("killed", pks)
+    (action,) = admin.actions
+
+    with pytest.raises(ValueError, match="running"):
+        action.resume("killed")
+
+    page = admin.action_progress_view(
+        _request("get", data={"format": "html"}), "killed"
+    )
+    assert b"Force resume" in page.content
+
+    admin.action_resume_view(_request("post", data={"force": "1"}), "killed")
+    progress = progress_store.get("killed")
+    assert progress.status == "finished"
+    assert (progress.processed, progress.total) == (3, 3)
+
+
+@pytest.mark.django_db
+def test_resume_view(admin_site, _request, model_instance):
+    """The admin's resume button should resume a failed run."""
+    instance = model_instance()
+    admin = ProgressTestModelAdmin(AdminActionsTestModel, admin_site)
+    progress_store.save(
+        Progress(
+            "stuck",
+            "tracked",
+            "app.AdminActionsTestModel",
+            1,
+            status="failed",
+            checkpointed=True,
+        )
+    )
+    progress_store.save_pks("stuck", [instance.pk])
+
+    page = admin.action_progress_view(_request("get", data={"format": "html"}), "stuck")
+    assert b'action="resume/"' in page.content
+
+    assert admin.action_resume_view(_request("get"), "stuck").status_code == 405
+
+    response = admin.action_resume_view(_request("post"), "stuck")
+    assert response.status_code == 302
+    assert progress_store.get("stuck").status == "finished"
+    assert progress_store.get("stuck").processed == 1
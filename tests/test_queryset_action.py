@@ -0,0 +1,85 @@
+from unittest import mock
+
+import pytest
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.messages import ERROR, SUCCESS
+from django.db.models import Q
+
+from action_hero.actions import QuerySetAction
+from action_hero.actions.queryset import RowLimitExceeded
+from tests.app.models import AdminActionsTestModel
+
+
+@pytest.mark.django_db
+def test_function_receives_filtered_queryset(
+    admin, model_instance, mock_messages, _request, django_assert_num_queries
+):
+    """The function should get the filtered queryset without rows being loaded."""
+    keep, rename = model_instance(), model_instance()
+    r = _request(method="post", data={ACTION_CHECKBOX_NAME: [keep.pk, rename.pk]})
+
+    action = QuerySetAction(
+        lambda queryset: queryset.update(name="renamed"),
+        name="rename",
+        condition=~Q(pk=keep.pk),
+    )
+    with django_assert_num_queries(2):  # One COUNT, one UPDATE
+        action(admin, r, AdminActionsTestModel.objects.all())
+
+    rename.refresh_from_db()
+    keep.refresh_from_db()
+    assert rename.name == "renamed"
+    assert keep.name != "renamed"
+    mock_messages.assert_called_once()
+    assert "for 1 " in mock_messages.call_args[0][1]
+    assert mock_messages.call_args[0][2] == SUCCESS
+
+
+@pytest.mark.django_db
+def test_selected_rows_count_when_function_returns_nothing(model_instance):
+    """Without a returned row count, every selected row counts as processed."""
+    for _ in range(3):
+        model_instance()
+    function = mock.Mock(return_value=None)
+
+    action = QuerySetAction(function, name="noop")
+    result = action.run(AdminActionsTestModel.objects.all())
+
+    assert result.processed == 3
+    (queryset,), _ = function.call_args
+    assert queryset.model is AdminActionsTestModel
+
+
+@pytest.mark.django_db
+def test_max_rows_guard(admin, model_instance, mock_messages, _request):
+    """Selecting more than ``max_rows`` rows should change nothing."""
+    for _ in range(3):
+        model_instance()
+    r = _request(method="post")
+    function = mock.Mock()
+
+    action = QuerySetAction(function, name="guarded", max_rows=2)
+    action(admin, r, AdminActionsTestModel.objects.all())
+
+    function.assert_not_called()
+    assert "at most 2" in mock_messages.call_args[0][1]
+    assert mock_messages.call_args[0][2] == ERROR
+    with pytest.raises(RowLimitExceeded):
+        action.run(AdminActionsTestModel.objects.all())
+
+
+def test_row_by_row_options_raise():
+    """Callable conditions and row-by-row options should be refused."""
+    with pytest.raises(TypeError):
+        QuerySetAction(mock.Mock(), name="bad", condition=lambda record: True)
+    with pytest.raises(TypeError):
+        QuerySetAction(mock.Mock(), name="bad", condition=[Q(), lambda r: True])
+    with pytest.raises(ValueError):
+        QuerySetAction(mock.Mock(), name="bad", chunk_size=10)
+    with pytest.raises(ValueError):
+        QuerySetAction(mock.Mock(), name="bad", max_rows=0)
+
+
+def test_atomic_needs_no_chunk_size():
+    """The single set-based call may run in a transaction without batches."""
+    assert QuerySetAction(mock.Mock(), name="atomic", atomic=True).atomic
@@ -1,9 +1,17 @@
 from unittest import mock
 
+import celery
 import pytest
 from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.messages import INFO
 
 from action_hero.actions import QueueCeleryAction
+from action_hero.actions.queue_celery import (
+    DEFAULT_BATCH_SIZE,
+    compress_pks,
+    expand_pks,
+)
+from action_hero.dedup import CacheDedupBackend, InMemoryDedupBackend
 from tests.app.models import AdminActionsTestModel
 
 
@@ -90,6 +98,28 @@ def test_celery_not_available(monkeypatch):
     assert "QueueCeleryAction" not in action_hero.actions.__all__
 
 
+def test_actions_are_imported_lazily(monkeypatch):
+    """Importing `action_hero.actions` shouldn't import an action's module until
+    the action is used."""
+    import importlib
+    import sys
+
+    import action_hero
+
+    monkeypatch.setattr(action_hero, "actions", action_hero.actions)
+    for name in ("action_hero.actions", "action_hero.actions.queue_celery"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+    actions = importlib.import_module("action_hero.actions")
+    assert "QueueCeleryAction" in actions.__all__
+    assert "action_hero.actions.queue_celery" not in sys.modules
+
+    assert actions.QueueCeleryAction.__name__ == "QueueCeleryAction"
+    assert "action_hero.actions.queue_celery" in sys.modules
+    with pytest.raises(AttributeError):
+        actions.MissingAction  # noqa: B018
+
+
 def test_celery_not_available_raises(monkeypatch):
     """Celery not being installed should raise an ImportError."""
     import sys
@@ -106,3 +136,190 @@ def test_celery_not_available_raises(monkeypatch):
         import action_hero.actions.queue_celery
 
         reload(action_hero.actions.queue_celery)
+
+
+@pytest.mark.django_db
+def test_group_dispatch_publishes_batches(
+    admin,
+    model_instance,
+    celery_task,
+    mock_delay,
+    _request,
+    monkeypatch,
+):
+    """Group dispatch should publish each batch as one group, not per record."""
+    instances = [model_instance() for _ in range(3)]
+    r = _request(method="post", data={ACTION_CHECKBOX_NAME: [i.pk for i in instances]})  # type: ignore
+    processed = []
+    monkeypatch.setattr(celery_task, "run", processed.append)
+
+    queue_action = QueueCeleryAction(celery_task, dispatch="group", chunk_size=2)
+    with mock.patch(
+        "celery.group.apply_async", autospec=True, side_effect=celery.group.apply
+    ) as apply_async:
+        queue_action(admin, r, AdminActionsTestModel.objects.order_by("pk"))
+
+    assert apply_async.call_count == 2  # One publish per chunk
+    mock_delay.assert_not_called()
+    assert processed == [i.pk for i in instances]
+
+
+def test_unknown_dispatch_raises(celery_task):
+    """An unknown dispatch mode should raise an error."""
+    with pytest.raises(ValueError):
+        # noinspection PyTypeChecker
+        QueueCeleryAction(celery_task, dispatch="carrier_pigeon")  # pyright: ignore[reportArgumentType]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("pk_format", "encode"),
+    [("list", list), ("ranges", compress_pks)],
+)
+def test_batch_dispatch_queues_one_task_per_batch(
+    admin,
+    model_instance,
+    celery_task,
+    mock_delay,
+    _request,
+    pk_format,
+    encode,
+):
+    """Batch dispatch should pass each batch's pks to a single task."""
+    instances = [model_instance() for _ in range(3)]
+    pks = [i.pk for i in instances]
+    r = _request(method="post", data={ACTION_CHECKBOX_NAME: pks})  # type: ignore
+
+    queue_action = QueueCeleryAction(
+        celery_task, dispatch="batch", pk_format=pk_format, chunk_size=2
+    )
+    queue_action(admin, r, AdminActionsTestModel.objects.order_by("pk"))
+
+    assert mock_delay.call_args_list == [
+        mock.call(encode(pks[:2])),
+        mock.call(encode(pks[2:])),
+    ]
+
+
+def test_batch_dispatch_has_default_batch_size(celery_task):
+    """Batch dispatch should not send the whole selection in one task."""
+    queue_action = QueueCeleryAction(celery_task, dispatch="batch")
+    assert queue_action.chunk_size == DEFAULT_BATCH_SIZE
+
+
+def test_pk_ranges_round_trip():
+    """Compressed pk ranges should expand back to the original keys."""
+    pks = [9, 1, 2, 3, 7, 8]
+    assert compress_pks(pks) == [[1, 3], [7, 9]]
+    assert expand_pks(compress_pks(pks)) == sorted(pks)
+
+
+def test_non_integer_pks_cannot_be_ranged():
+    """Ranges only make sense for integer primary keys."""
+    with pytest.raises(TypeError):
+        compress_pks(["a", "b"])  # pyright: ignore[reportArgumentType]
+
+
+def test_unknown_pk_format_raises(celery_task):
+    """An unknown pk format should raise an error."""
+    with pytest.raises(ValueError):
+        # noinspection PyTypeChecker
+        QueueCeleryAction(celery_task, dispatch="batch", pk_format="csv")  # pyright: ignore[reportArgumentType]
+
+
+@pytest.mark.django_db
+def test_dedup_skips_records_already_queued(
+    admin, model_instance, celery_task, mock_delay, _request, mock_messages
+):
+    """Records queued within the TTL should be skipped on a second run."""
+    first, second = model_instance(), model_instance()
+    r = _request(method="post", data={ACTION_CHECKBOX_NAME: [first.pk, second.pk]})  # type: ignore
+    dedup = InMemoryDedupBackend()
+
+    queue_action = QueueCeleryAction(celery_task, dedup=dedup)
+    queue_action(admin, r, AdminActionsTestModel.objects.filter(pk=first.pk))
+    result = queue_action.run(AdminActionsTestModel.objects.order_by("pk"))
+
+    assert mock_delay.call_args_list == [mock.call(first.pk), mock.call(second.pk)]
+    assert (result.processed, result.skipped) == (1, 1)
+
+    dedup.clear()
+    queue_action.run(AdminActionsTestModel.objects.filter(pk=first.pk))
+    assert mock_delay.call_count == 3
+
+
+@pytest.mark.django_db
+def test_double_click_reports_skipped_records(
+    admin, model_instance, celery_task, mock_delay, _request, mock_messages
+):
+    """A second run that skips every record should still tell the user."""
+    instances = [model_instance(), model_instance()]
+    r = _request(method="post", data={ACTION_CHECKBOX_NAME: [i.pk for i in instances]})  # type: ignore
+
+    queue_action = QueueCeleryAction(celery_task, dedup=InMemoryDedupBackend())
+    queue_action(admin, r, AdminActionsTestModel.objects.all())
+    queue_action(admin, r, AdminActionsTestModel.objects.all())
+
+    assert mock_delay.call_count == 2
+    assert mock_messages.call_count == 2
+    message, level = mock_messages.call_args[0][1:3]
+    assert "2 already queued, skipped" in message
+    assert level == INFO
+
+
+@pytest.mark.django_db
+def test_dedup_releases_records_that_failed_to_queue(
+    model_instance, celery_task, mock_delay
+):
+    """A record that couldn't be queued should be queued on the next run."""
+    model_instance()
+    mock_delay.side_effect = [ConnectionError("broker down"), None]
+
+    queue_action = QueueCeleryAction(
+        celery_task, dedup=InMemoryDedupBackend(), on_error="skip"
+    )
+    assert queue_action.run(AdminActionsTestModel.objects.all()).failed == 1
+    assert queue_action.run(AdminActionsTestModel.objects.all()).processed == 1
+
+
+@pytest.mark.django_db
+def test_dedup_keeps_records_queued_before_a_raise(
+    model_instance, celery_task, mock_delay
+):
+    """When queuing raises, records already queued should stay claimed."""
+    model_instance()
+    second = model_instance()
+    mock_delay.side_effect = [None, ConnectionError("broker down")]
+
+    queue_action = QueueCeleryAction(
+        celery_task, dedup=InMemoryDedupBackend(), on_error="raise"
+    )
+    with pytest.raises(ConnectionError):
+        queue_action.run(AdminActionsTestModel.objects.order_by("pk"))
+
+    mock_delay.reset_mock(side_effect=True)
+    queue_action.run(AdminActionsTestModel.objects.order_by("pk"))
+    mock_delay.assert_called_once_with(second.pk)
+
+
+def test_dedup_backends_claim_unclaimed_keys():
+    """Both backends should only claim keys that aren't held, until they expire
+    or are released."""
+    for dedup in (InMemoryDedupBackend(), CacheDedupBackend()):
+        assert dedup.claim(["a", "b"], 60) == {"a", "b"}
+        assert dedup.claim(["b", "c"], 60) == {"c"}
+        dedup.release(["b"])
+        assert dedup.claim(["b"], 60) == {"b"}
+
+    dedup = InMemoryDedupBackend()
+    with mock.patch("action_hero.dedup.time.monotonic", side_effect=[0.0, 61.0]):
+        dedup.claim(["a"], 60)
+        assert dedup.claim(["a"], 60) == {"a"}
+
+
+def test_invalid_dedup_raises(celery_task):
+    """A dedup backend of the wrong type or a bad TTL should raise an error."""
+    with pytest.raises(TypeError):
+        QueueCeleryAction(celery_task, dedup=set())
+    with pytest.raises(ValueError):
+        QueueCeleryAction(celery_task, dedup=InMemoryDedupBackend(), dedup_ttl=0)
@@ -24,3 +24,47 @@ def test_function_is_called_appropriately(
     queue_action(admin, r, AdminActionsTestModel.objects.all())
 
     mock_function.assert_called_once_with(instance.pk)
+
+
+@pytest.mark.django_db
+def test_unconditional_action_fetches_only_pks(
+    admin,
+    model_instance,
+    mock_function,
+    _request,
+    django_assert_num_queries,
+):
+    """Without a callable condition, only primary keys should be selected."""
+    instance = model_instance()
+    r = _request(method="post", data={ACTION_CHECKBOX_NAME: [instance.pk]})
+
+    queue_action = SimpleAction(mock_function, chunk_size=10)
+    with django_assert_num_queries(1) as captured:
+        queue_action(admin, r, AdminActionsTestModel.objects.all())
+
+    assert '"name"' not in captured.captured_queries[0]["sql"]
+    mock_function.assert_called_once_with(instance.pk)
+
+
+@pytest.mark.django_db
+def test_subclass_overriding_handle_item_gets_instances(model_instance, mock_function):
+    """A subclass reading fields in ``handle_item`` should still get model
+    instances, unless it opts in to primary keys."""
+    instance = model_instance()
+
+    class NameAction(SimpleAction):
+        def handle_item(self, item):
+            self.function(item.name)
+
+    class PkAction(SimpleAction):
+        pk_only = True
+
+        def handle_item(self, item):
+            self.function(item)
+
+    NameAction(mock_function).run(AdminActionsTestModel.objects.all())
+    mock_function.assert_called_once_with(instance.name)
+
+    mock_function.reset_mock()
+    PkAction(mock_function).run(AdminActionsTestModel.objects.all())
+    mock_function.assert_called_once_with(instance.pk)
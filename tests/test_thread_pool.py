@@ -0,0 +1,90 @@
+import threading
+from unittest import mock
+
+import pytest
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.messages import SUCCESS, WARNING
+
+from action_hero.actions import ThreadPoolAction
+from tests.app.models import AdminActionsTestModel
+
+
+@pytest.mark.django_db
+def test_function_is_called_in_threads(
+    admin,
+    model_instance,
+    mock_messages,
+    _request,
+):
+    """Every record should be handled, concurrently, outside the main thread."""
+    instances = [model_instance() for _ in range(4)]
+    r = _request(method="post", data={ACTION_CHECKBOX_NAME: [i.pk for i in instances]})
+    barrier = threading.Barrier(2, timeout=5)
+    threads = set()
+
+    def _function(pk):
+        barrier.wait()  # Only passes if two calls run at the same time
+        threads.add(threading.current_thread())
+
+    pool_action = ThreadPoolAction(_function, max_workers=2)
+    pool_action(admin, r, AdminActionsTestModel.objects.all())
+
+    assert threading.current_thread() not in threads
+    assert len(threads) == 2
+    mock_messages.assert_called_once()
+    assert mock_messages.call_args[0][2] == SUCCESS
+
+
+@pytest.mark.django_db
+def test_failures_are_counted_not_raised(
+    admin,
+    model_instance,
+    mock_messages,
+    _request,
+):
+    """A failing call should not stop the others, and should be reported."""
+    instances = [model_instance() for _ in range(3)]
+    r = _request(method="post", data={ACTION_CHECKBOX_NAME: [i.pk for i in instances]})
+    handled = mock.Mock()
+
+    def _function(pk):
+        if pk == instances[1].pk:
+            raise RuntimeError("Downstream API is down.")
+        handled(pk)
+
+    pool_action = ThreadPoolAction(_function, max_workers=2)
+    pool_action(admin, r, AdminActionsTestModel.objects.all())
+
+    handled.assert_has_calls(
+        [mock.call(instances[0].pk), mock.call(instances[2].pk)], any_order=True
+    )
+    mock_messages.assert_called_once()
+    message = mock_messages.call_args[0][1]
+    assert "for 2 " in message
+    assert "1 failed" in message
+    assert mock_messages.call_args[0][2] == WARNING
+
+
+def test_nonpositive_max_workers_raises():
+    """A pool needs at least one worker."""
+    with pytest.raises(ValueError):
+        ThreadPoolAction(lambda _: ..., max_workers=0)
+
+
+@pytest.mark.django_db
+def test_raise_policy_stops_after_failures(model_instance):
+    """With on_error="raise", a failure in the pool should be raised."""
+    model_instance()
+
+    def _function(pk):
+        raise RuntimeError("Downstream API is down.")
+
+    pool_action = ThreadPoolAction(_function, on_error="raise")
+    with pytest.raises(RuntimeError):
+        pool_action.run(AdminActionsTestModel.objects.all())
+
+
+def test_atomic_is_rejected():
+    """Transactions can't cover work done in other threads."""
+    with pytest.raises(ValueError):
+        ThreadPoolAction(lambda _: ..., atomic=True)
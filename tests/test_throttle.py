@@ -0,0 +1,163 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from action_hero.actions import (
+    AsyncAction,
+    BatchAction,
+    ProcessPoolAction,
+    SimpleAction,
+    ThreadPoolAction,
+)
+from action_hero.throttle import Throttle
+from tests.app.models import AdminActionsTestModel
+
+
+class FakeClock:
+    """Stands in for the ``time`` module, only moving when slept."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """Replace the throttle's clock with a fake one."""
+    fake = FakeClock()
+    with mock.patch("action_hero.throttle.time", fake):
+        yield fake
+
+
+@pytest.mark.django_db
+def test_rate_limits_calls(clock, model_instance, mock_function):
+    """Calls beyond the burst should wait for the bucket to refill."""
+    for _ in range(4):
+        model_instance()
+
+    action = SimpleAction(mock_function, throttle=Throttle(rate=2, burst=2))
+    action.run(AdminActionsTestModel.objects.all())
+
+    assert mock_function.call_count == 4
+    assert clock.sleeps == [0.5, 0.5]
+
+
+@pytest.mark.django_db
+def test_batch_action_is_throttled(clock, model_instance, mock_function):
+    """Each batch should take one slot of the throttle."""
+    for _ in range(4):
+        model_instance()
+
+    action = BatchAction(
+        mock_function, chunk_size=2, throttle=Throttle(rate=1, burst=1)
+    )
+    action.run(AdminActionsTestModel.objects.all())
+
+    assert mock_function.call_count == 2
+    assert clock.sleeps == [1.0]
+
+
+def test_large_group_leaves_bucket_in_debt(clock):
+    """A group larger than the burst should start once the bucket is full."""
+    throttle = Throttle(rate=10, burst=5)
+
+    throttle.acquire(20)
+    assert clock.sleeps == []
+    throttle.acquire(1)
+    assert clock.sleeps == [pytest.approx(1.6)]
+
+
+def test_queue_depth_backs_off(clock):
+    """Dispatch should pause, backing off, while the queue is too deep."""
+    depth = mock.Mock(side_effect=[50, 50, 50, 50, 0, 0])
+    throttle = Throttle(queue_depth=depth, max_queue_depth=10, backoff=1, max_backoff=3)
+
+    throttle.acquire()
+    assert clock.sleeps == [1, 2, 3, 3]
+
+    throttle.acquire()  # Checked less than a second ago
+    assert depth.call_count == 5
+    clock.now += 1
+    throttle.acquire()
+    assert depth.call_count == 6
+
+
+@pytest.mark.django_db
+def test_max_in_flight_caps_concurrency(model_instance):
+    """No more calls than ``max_in_flight`` should run at the same time."""
+    for _ in range(6):
+        model_instance()
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def _function(pk):
+        with lock:
+            running.append(pk)
+            peak.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(pk)
+
+    action = ThreadPoolAction(
+        _function, max_workers=4, throttle=Throttle(max_in_flight=2)
+    )
+    assert action.run(AdminActionsTestModel.objects.all()).processed == 6
+    assert max(peak) == 2
+
+
+def test_group_larger_than_cap_runs_alone():
+    """A group larger than ``max_in_flight`` should wait for an empty slate."""
+    throttle = Throttle(max_in_flight=2)
+
+    with throttle.slot(5):
+        started = threading.Event()
+        worker = threading.Thread(target=lambda: (throttle.acquire(), started.set()))
+        worker.start()
+        assert not started.wait(0.05)
+    assert started.wait(5)
+    worker.join()
+
+
+@pytest.mark.django_db
+def test_async_action_is_throttled(model_instance):
+    """Coroutines should take a slot each without blocking the event loop."""
+    for _ in range(3):
+        model_instance()
+    throttle = Throttle(max_in_flight=1)
+    calls = []
+
+    async def _function(pk):
+        calls.append(throttle._in_flight)
+
+    AsyncAction(_function, throttle=throttle).run(AdminActionsTestModel.objects.all())
+
+    assert calls == [1, 1, 1]
+    assert throttle._in_flight == 0
+
+
+def test_invalid_throttle_raises(mock_function):
+    """Bad limits, or a throttle where one can't work, should raise an error."""
+    with pytest.raises(ValueError):
+        Throttle(rate=0)
+    with pytest.raises(ValueError):
+        Throttle(burst=5)
+    with pytest.raises(ValueError):
+        Throttle(max_in_flight=0)
+    with pytest.raises(ValueError):
+        Throttle(queue_depth=lambda: 0)
+    with pytest.raises(ValueError):
+        Throttle(backoff=5, max_backoff=1)
+    with pytest.raises(TypeError):
+        SimpleAction(mock_function, throttle=10)
+    with pytest.raises(ValueError):
+        ProcessPoolAction(print, throttle=Throttle(rate=1))